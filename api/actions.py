@@ -1,14 +1,22 @@
+import collections
+import functools
+import io
 import itertools
 import json
 import re
+import secrets
+import threading
+import time
 import traceback
-from datetime import datetime
+from datetime import datetime, timedelta
 
 import psycopg2
+import psycopg2.extras
 import sqlalchemy as sqla
 from django.core.exceptions import PermissionDenied
 from django.http import Http404
 from sqlalchemy import func, MetaData, Table
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm.session import sessionmaker
 
@@ -28,10 +36,44 @@ import logging
 
 logger = logging.getLogger('oeplatform')
 
+# Every API request checks that the addressed schema and table exist.
+# Schemas hardly ever change, so found schemas are remembered for a minute.
+# Found tables expire sooner and are dropped together with the table
+# descriptions (see :meth:`clear_describe_cache`). Misses are not kept, as
+# the schema or table may be created by another process at any time.
+_SCHEMA_CACHE_TTL = 60
+_TABLE_CACHE_TTL = 10
+
+# Time window (see :meth:`_cache_bucket`) in which a schema or table was
+# last found, by name
+_FOUND_SCHEMAS = {}
+_FOUND_TABLES = {}
+
+
+def _schema_exists(schema):
+    bucket = _cache_bucket(_SCHEMA_CACHE_TTL)
+    if _FOUND_SCHEMAS.get(schema) == bucket:
+        return True
+    exists = has_schema(dict(schema=schema))
+    if exists:
+        _FOUND_SCHEMAS[schema] = bucket
+    return exists
+
+
+def _table_exists(schema, table):
+    bucket = _cache_bucket(_TABLE_CACHE_TTL)
+    if _FOUND_TABLES.get((schema, table)) == bucket:
+        return True
+    exists = has_table(dict(schema=schema, table=table))
+    if exists:
+        _FOUND_TABLES[(schema, table)] = bucket
+    return exists
+
+
 def get_table_name(schema, table, restrict_schemas=True):
-    if not has_schema(dict(schema=schema)):
+    if not _schema_exists(schema):
         raise Http404
-    if not has_table(dict(schema=schema, table=table)):
+    if not _table_exists(schema, table):
         raise Http404
     if schema.startswith('_') or schema == 'public' or schema is None:
         raise PermissionDenied
@@ -40,12 +82,79 @@ def get_table_name(schema, table, restrict_schemas=True):
             raise PermissionDenied
     return schema, table
 
-__CONNECTIONS = {}
-__CURSORS = {}
+
+class _Registry:
+    """
+    Bounded registry of open connections or cursors that are handed out to
+    clients by a random id. Entries that have not been accessed for `ttl`
+    seconds and, if the registry is full, the least recently used entries
+    are closed and dropped whenever a new entry is added. Pinned entries are
+    never evicted; whoever adds them has to pop them again.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._entries = collections.OrderedDict()
+        self._pinned = {}
+        self._lock = threading.Lock()
+
+    def add(self, item, pinned=False):
+        with self._lock:
+            if pinned:
+                key = secrets.token_hex(16)
+                self._pinned[key] = item
+                return key
+            now = time.monotonic()
+            while self._entries:
+                key, (oldest, last_access) = next(iter(self._entries.items()))
+                if (len(self._entries) < self._maxsize
+                        and now - last_access < self._ttl):
+                    break
+                del self._entries[key]
+                try:
+                    oldest.close()
+                except Exception:
+                    logger.exception('Failed to close evicted %r', oldest)
+            key = secrets.token_hex(16)
+            self._entries[key] = (item, now)
+            return key
+
+    def get(self, key):
+        """
+        Returns the entry registered under `key` and marks it as accessed,
+        or None if there is no such entry (anymore).
+        """
+        with self._lock:
+            if key in self._pinned:
+                return self._pinned[key]
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries[key] = (entry[0], time.monotonic())
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def pop(self, key, default=None):
+        with self._lock:
+            if key in self._pinned:
+                return self._pinned.pop(key)
+            item, _ = self._entries.pop(key, (default, None))
+            return item
+
+
+__CONNECTIONS = _Registry(maxsize=256, ttl=300)
+__CURSORS = _Registry(maxsize=1024, ttl=300)
 
 
 Base = declarative_base()
 
+# Session factory shared by all actions that need a transactional session.
+# Every call opens a session of its own, which the action closes after use,
+# so actions that call each other never close a session still in use.
+Session = sessionmaker(bind=_get_engine(), expire_on_commit=False,
+                       autoflush=False)
+
 
 class ResponsiveException(Exception):
     pass
@@ -58,8 +167,9 @@ def load_cursor(f):
             engine = _get_engine()
             connection = engine.connect()
             cursor = connection.connection.cursor()
-            cursor_id = cursor.__hash__()
-            __CURSORS[cursor_id] = cursor
+            # The cursor is closed below once the request is done, so it must
+            # not be evicted while the request is still using it.
+            cursor_id = __CURSORS.add(cursor, pinned=True)
 
             # django_restframework passes different data dictionaries depending
             # on the request type: PUT -> Mutable, POST -> Immutable
@@ -74,7 +184,7 @@ def load_cursor(f):
                     result = {}
                 if cursor.description:
                     result['description'] = cursor.description
-                    result['data'] = [list(map(__translate_fetched_cell, row)) for row in cursor.fetchall()]
+                    result['data'] = __fetch_translated_rows(cursor)
         finally:
             if fetch_all:
                 close_cursor({}, {'cursor_id': cursor_id})
@@ -84,14 +194,42 @@ def load_cursor(f):
         return result
     return wrapper
 
+# Number of rows fetched at once if cells have to be translated
+_FETCH_BATCH_SIZE = 10000
+# Type code psycopg2 reports for bytea columns, which are returned as
+# memoryview
+_BYTEA_OID = 17
+
+
+def __fetch_translated_rows(cursor):
+    positions = [i for i, col in enumerate(cursor.description)
+                 if col.type_code == _BYTEA_OID]
+    if not positions:
+        # Nothing to translate, so the fetched rows can be passed on as is.
+        return cursor.fetchall()
+    # Only cells of bytea columns can contain memoryviews, so all other
+    # cells are copied without looking at them.
+    translate = __translate_fetched_cell
+    data = []
+    while True:
+        chunk = cursor.fetchmany(_FETCH_BATCH_SIZE)
+        if not chunk:
+            break
+        for row in chunk:
+            row = list(row)
+            for i in positions:
+                row[i] = translate(row[i])
+            data.append(row)
+    return data
+
+
 def __translate_fetched_cell(cell):
-    if isinstance(cell, geoalchemy2.WKBElement):
-        return _get_engine().execute(cell.ST_AsText()).scalar()
-    elif isinstance(cell, memoryview):
+    if isinstance(cell, memoryview):
         return wkb.dumps(wkb.loads(cell.tobytes()), hex=True)
     else:
         return cell
 
+
 def __response_success():
     return {'success': True}
 
@@ -111,7 +249,38 @@ def _translate_sqla_type(t, el):
         return t
 
 
-def describe_columns(schema, table):
+# Table descriptions are requested repeatedly while queued changes are
+# applied. They are kept for a few seconds and dropped whenever a table is
+# altered through this module. Cached descriptions must not be modified by
+# the caller.
+_DESCRIBE_CACHE_TTL = 10
+
+
+def _cache_bucket(ttl):
+    """
+    Returns the index of the current time window of `ttl` seconds. Adding
+    it to the key of a memoized function makes its entries expire.
+    """
+    return int(time.monotonic() // ttl)
+
+
+def clear_describe_cache():
+    """
+    Drops all cached table descriptions, reflected tables and table
+    existence lookups. Has to be called after DDL statements that create or
+    drop tables or change their columns, indexes or constraints.
+    """
+    _FOUND_SCHEMAS.clear()
+    _FOUND_TABLES.clear()
+    _META_TABLES_CACHE.clear()
+    _describe_columns.cache_clear()
+    _describe_indexes.cache_clear()
+    _describe_constraints.cache_clear()
+    _insert_check_constraints.cache_clear()
+    _reflect_table.cache_clear()
+
+
+def describe_columns(schema, table, connection=None):
     """
     Loads the description of all columns of the specified table and return their
     description as a dictionary. Each column is identified by its name and
@@ -136,26 +305,79 @@ def describe_columns(schema, table):
 
     :param table: Table name
 
+    :param connection: Connection to read the columns on. Descriptions read
+        on a given connection reflect its uncommitted changes and are not
+        cached.
+
     :return: A dictionary of describing dictionaries representing the columns
     identified by their column names
     """
-
-    engine = _get_engine()
-    session = sessionmaker(bind=engine)()
-    query = 'select column_name, ' \
-            'c.ordinal_position, c.column_default, c.is_nullable, c.data_type, ' \
-            'c.character_maximum_length, c.character_octet_length, ' \
-            'c.numeric_precision, c.numeric_precision_radix, c.numeric_scale, ' \
-            'c.datetime_precision, c.interval_type, c.interval_precision, ' \
-            'c.maximum_cardinality, c.dtd_identifier, c.is_updatable, e.data_type as element_type ' \
-            'from INFORMATION_SCHEMA.COLUMNS  c ' \
-            'LEFT JOIN information_schema.element_types e ' \
-            'ON ((c.table_catalog, c.table_schema, c.table_name, \'TABLE\', c.dtd_identifier) ' \
-            '= (e.object_catalog, e.object_schema, e.object_name, e.object_type, e.collection_type_identifier)) where table_name = ' \
-            '\'{table}\' and table_schema=\'{schema}\';'.format(
-        table=table, schema=schema)
-    response = session.execute(query)
-    session.close()
+    if connection is not None:
+        return _read_columns(connection, schema, table)
+    return _describe_columns(schema, table, _cache_bucket(_DESCRIBE_CACHE_TTL))
+
+
+# Mirrors the definition of information_schema.columns (and the element
+# type of information_schema.element_types) but starts from the catalog
+# entries of a single table. Querying the views directly makes Postgres
+# evaluate them for every column in the database.
+_describe_columns_sql = sqla.text(
+    "SELECT a.attname AS column_name, "
+    "a.attnum AS ordinal_position, "
+    "pg_get_expr(ad.adbin, ad.adrelid) AS column_default, "
+    "CASE WHEN a.attnotnull OR (t.typtype = 'd' AND t.typnotnull) "
+    "THEN 'NO' ELSE 'YES' END AS is_nullable, "
+    "CASE WHEN t.typtype = 'd' THEN "
+    "CASE WHEN bt.typelem <> 0 AND bt.typlen = -1 THEN 'ARRAY' "
+    "WHEN nbt.nspname = 'pg_catalog' THEN format_type(t.typbasetype, null) "
+    "ELSE 'USER-DEFINED' END "
+    "ELSE "
+    "CASE WHEN t.typelem <> 0 AND t.typlen = -1 THEN 'ARRAY' "
+    "WHEN nt.nspname = 'pg_catalog' THEN format_type(a.atttypid, null) "
+    "ELSE 'USER-DEFINED' END "
+    "END AS data_type, "
+    "information_schema._pg_char_max_length(information_schema._pg_truetypid(a, t), information_schema._pg_truetypmod(a, t)) AS character_maximum_length, "
+    "information_schema._pg_char_octet_length(information_schema._pg_truetypid(a, t), information_schema._pg_truetypmod(a, t)) AS character_octet_length, "
+    "information_schema._pg_numeric_precision(information_schema._pg_truetypid(a, t), information_schema._pg_truetypmod(a, t)) AS numeric_precision, "
+    "information_schema._pg_numeric_precision_radix(information_schema._pg_truetypid(a, t), information_schema._pg_truetypmod(a, t)) AS numeric_precision_radix, "
+    "information_schema._pg_numeric_scale(information_schema._pg_truetypid(a, t), information_schema._pg_truetypmod(a, t)) AS numeric_scale, "
+    "information_schema._pg_datetime_precision(information_schema._pg_truetypid(a, t), information_schema._pg_truetypmod(a, t)) AS datetime_precision, "
+    "information_schema._pg_interval_type(information_schema._pg_truetypid(a, t), information_schema._pg_truetypmod(a, t))::text AS interval_type, "
+    "null::integer AS interval_precision, "
+    "null::integer AS maximum_cardinality, "
+    "a.attnum::text AS dtd_identifier, "
+    "CASE WHEN c.relkind IN ('r', 'p') "
+    "OR (c.relkind IN ('v', 'f') AND pg_column_is_updatable(c.oid, a.attnum, false)) "
+    "THEN 'YES' ELSE 'NO' END AS is_updatable, "
+    "CASE WHEN net.nspname = 'pg_catalog' THEN format_type(et.oid, null) "
+    "WHEN et.oid IS NOT NULL THEN 'USER-DEFINED' END AS element_type "
+    "FROM pg_attribute a "
+    "JOIN pg_class c ON a.attrelid = c.oid "
+    "JOIN pg_namespace nc ON c.relnamespace = nc.oid "
+    "JOIN pg_type t ON a.atttypid = t.oid "
+    "JOIN pg_namespace nt ON t.typnamespace = nt.oid "
+    "LEFT JOIN pg_attrdef ad ON a.attrelid = ad.adrelid AND a.attnum = ad.adnum "
+    "LEFT JOIN (pg_type bt JOIN pg_namespace nbt ON bt.typnamespace = nbt.oid) "
+    "ON t.typtype = 'd' AND t.typbasetype = bt.oid "
+    "LEFT JOIN (pg_type et JOIN pg_namespace net ON et.typnamespace = net.oid) "
+    "ON COALESCE(bt.typelem, t.typelem) <> 0 "
+    "AND COALESCE(bt.typlen, t.typlen) = -1 "
+    "AND et.oid = COALESCE(bt.typelem, t.typelem) "
+    "WHERE nc.nspname = :schema AND c.relname = :table "
+    "AND c.relkind IN ('r', 'v', 'f', 'p') "
+    "AND a.attnum > 0 AND NOT a.attisdropped;")
+
+
+@functools.lru_cache(maxsize=512)
+def _describe_columns(schema, table, bucket):
+    with _get_engine().connect() as connection:
+        return _read_columns(connection, schema, table)
+
+
+def _read_columns(connection, schema, table):
+    response = connection.execute(_describe_columns_sql,
+                                  {'schema': schema,
+                                   'table': table}).fetchall()
     return {column.column_name: {
         'ordinal_position': column.ordinal_position,
         'column_default': column.column_default,
@@ -191,13 +413,20 @@ def describe_indexes(schema, table):
     :return: A dictionary of describing dictionaries representing the indexed
     identified by their column names
     """
-    engine = _get_engine()
-    session = sessionmaker(bind=engine)()
-    query = 'select indexname, indexdef from pg_indexes where tablename = ' \
-            '\'{table}\' and schemaname=\'{schema}\';'.format(
-        table=table, schema=schema)
-    response = session.execute(query)
-    session.close()
+    return _describe_indexes(schema, table, _cache_bucket(_DESCRIBE_CACHE_TTL))
+
+
+_describe_indexes_sql = sqla.text(
+    "SELECT indexname, indexdef FROM pg_indexes "
+    "WHERE tablename = :table AND schemaname = :schema;")
+
+
+@functools.lru_cache(maxsize=512)
+def _describe_indexes(schema, table, bucket):
+    with _get_engine().connect() as connection:
+        response = connection.execute(_describe_indexes_sql,
+                                      {'schema': schema,
+                                       'table': table}).fetchall()
 
     # Use a single-value dictionary to allow future extension with downward
     # compatibility
@@ -225,13 +454,32 @@ def describe_constraints(schema, table):
     :return: A dictionary of describing dictionaries representing the columns
     identified by their column names
     """
-
-    engine = _get_engine()
-    session = sessionmaker(bind=engine)()
-    query = 'select constraint_name, constraint_type, is_deferrable, initially_deferred, pg_get_constraintdef(c.oid) as definition from information_schema.table_constraints JOIN pg_constraint AS c  ON c.conname=constraint_name where table_name=\'{table}\' AND constraint_schema=\'{schema}\';'.format(
-        table=table, schema=schema)
-    response = session.execute(query)
-    session.close()
+    return _describe_constraints(schema, table, _cache_bucket(_DESCRIBE_CACHE_TTL))
+
+
+# Mirrors information_schema.table_constraints for a single table
+_describe_constraints_sql = sqla.text(
+    "SELECT con.conname AS constraint_name, "
+    "CASE con.contype WHEN 'c' THEN 'CHECK' "
+    "WHEN 'f' THEN 'FOREIGN KEY' "
+    "WHEN 'p' THEN 'PRIMARY KEY' "
+    "WHEN 'u' THEN 'UNIQUE' END AS constraint_type, "
+    "CASE WHEN con.condeferrable THEN 'YES' ELSE 'NO' END AS is_deferrable, "
+    "CASE WHEN con.condeferred THEN 'YES' ELSE 'NO' END AS initially_deferred, "
+    "pg_get_constraintdef(con.oid) AS definition "
+    "FROM pg_constraint con "
+    "JOIN pg_class c ON con.conrelid = c.oid "
+    "JOIN pg_namespace n ON c.relnamespace = n.oid "
+    "WHERE n.nspname = :schema AND c.relname = :table "
+    "AND con.contype IN ('c', 'f', 'p', 'u');")
+
+
+@functools.lru_cache(maxsize=512)
+def _describe_constraints(schema, table, bucket):
+    with _get_engine().connect() as connection:
+        response = connection.execute(_describe_constraints_sql,
+                                      {'schema': schema,
+                                       'table': table}).fetchall()
     return {column.constraint_name: {
         'constraint_type': column.constraint_type,
         'is_deferrable': column.is_deferrable,
@@ -242,40 +490,73 @@ def describe_constraints(schema, table):
 
 
 
-def perform_sql(sql_statement, parameter=None):
+def perform_sql(sql_statement, parameter=None, connection=None):
     """
     Performs a sql command on standard database.
-    :param sql_statement: SQL-Command
+    :param sql_statement: SQL-Command, either as string or as prepared
+        `sqlalchemy.text` clause
+    :param parameter: Values for the bind parameters used in `sql_statement`
+    :param connection: An open connection to execute the command on. If given,
+        the caller is responsible for committing the surrounding transaction.
+        Otherwise, the command is executed and committed in its own session.
     :return: Dictionary with results
     """
 
     if not parameter:
         parameter = {}
 
-    engine = _get_engine()
-    session = sessionmaker(bind=engine)()
-
     # Statement built and no changes required, so statement is empty.
-    logger.debug("SQL STATEMENT: |" + sql_statement + "| \t " + str(parameter))
-    if not sql_statement or sql_statement.isspace():
+    logger.debug("SQL STATEMENT: |" + str(sql_statement) + "| \t " + str(parameter))
+    if isinstance(sql_statement, str) and (not sql_statement or sql_statement.isspace()):
         return get_response_dict(success=True)
 
+    if isinstance(sql_statement, str):
+        sql_statement = sqla.text(sql_statement)
+
     try:
-        result = session.execute(sql_statement, parameter)
+        if connection is not None:
+            result = connection.execute(sql_statement, parameter)
+        else:
+            # Commits on success and rolls back on failure before the
+            # connection is returned to the pool
+            with _get_engine().begin() as own_connection:
+                result = own_connection.execute(sql_statement, parameter)
     except Exception as e:
         print("SQL Action failed. \n Error:\n" + str(e))
-        session.rollback()
         raise APIError(str(e))
-    else:
-        # Why is commit() not part of close() ?
-        # I have to commit the changes before closing session. Otherwise the changes are not persistent.
-        session.commit()
-    finally:
-        session.close()
 
     return get_response_dict(success=True, result=result)
 
 
+# Statements on the change queues are static and only differ in their
+# parameters. Build them once so they are not re-assembled on every call.
+_remove_column_sql = sqla.text(
+    "UPDATE api_columns SET reviewed=True WHERE id=:id")
+_apply_column_success_sql = sqla.text(
+    "UPDATE api_columns SET reviewed=True, changed=True WHERE id = ANY(:ids)")
+_apply_column_failure_sql = sqla.text(
+    "UPDATE api_columns SET reviewed=False, changed=False, "
+    "exception=:exception WHERE id=:id")
+_remove_constraint_sql = sqla.text(
+    "UPDATE api_constraints SET reviewed=True WHERE id=:id")
+_apply_constraint_success_sql = sqla.text(
+    "UPDATE api_constraints SET reviewed=True, changed=True "
+    "WHERE id = ANY(:ids)")
+_apply_constraint_failure_sql = sqla.text(
+    "UPDATE api_constraints SET reviewed=False, changed=False, "
+    "exception=:exception WHERE id=:id")
+_queue_column_sql = sqla.text(
+    "INSERT INTO public.api_columns (column_name, not_null, data_type, "
+    "new_name, c_schema, c_table) "
+    "VALUES (:name, :not_null, :data_type, :new_name, :c_schema, :c_table);")
+_queue_constraint_sql = sqla.text(
+    "INSERT INTO public.api_constraints (action, constraint_type, "
+    "constraint_name, constraint_parameter, reference_table, "
+    "reference_column, c_schema, c_table) "
+    "VALUES (:action, :c_type, :c_name, :c_parameter, :r_table, :r_column, "
+    ":c_schema, :c_table);")
+
+
 def remove_queued_column(id):
     """
     Remove a requested change.
@@ -283,8 +564,8 @@ def remove_queued_column(id):
     :return: Nothing
     """
 
-    sql = "UPDATE api_columns SET reviewed=True WHERE id='{id}'".format(id=id)
-    perform_sql(sql)
+    perform_sql(_remove_column_sql, {'id': id})
+    clear_change_cache()
 
 
 def apply_queued_column(id):
@@ -294,18 +575,20 @@ def apply_queued_column(id):
     :return: Result of Database Operation
     """
 
-    column_description = get_column_change(id)
-    res = table_change_column(column_description)
+    return apply_queued_columns([id])[int(id)]
 
-    if res.get('success') is True:
-        sql = "UPDATE api_columns SET reviewed=True, changed=True WHERE id='{id}'".format(id=id)
-    else:
-        ex_str = str(res.get('exception'))
-        sql = "UPDATE api_columns SET reviewed=False, changed=False, exception={ex_str} WHERE id='{id}'".format(id=id,
-                                                                                                                ex_str=ex_str)
 
-    perform_sql(sql)
-    return res
+def apply_queued_columns(ids):
+    """
+    Apply several requested changes within a single transaction
+    :param ids: ids of Changes
+    :return: Dictionary that maps each id to the result of its Database
+        Operation
+    """
+
+    return _apply_queued_changes(ids, get_column_change, table_change_column,
+                                 _apply_column_success_sql,
+                                 _apply_column_failure_sql)
 
 
 def apply_queued_constraint(id):
@@ -315,17 +598,77 @@ def apply_queued_constraint(id):
     :return: Result of Database Operation
     """
 
-    constraint_description = get_constraint_change(id)
-    res = table_change_constraint(constraint_description)
+    return apply_queued_constraints([id])[int(id)]
+
+
+def apply_queued_constraints(ids):
+    """
+    Apply several requested changes to constraints within a single transaction
+    :param ids: ids of Changes
+    :return: Dictionary that maps each id to the result of its Database
+        Operation
+    """
+
+    return _apply_queued_changes(ids, get_constraint_change,
+                                 table_change_constraint,
+                                 _apply_constraint_success_sql,
+                                 _apply_constraint_failure_sql)
 
-    if res.get('success') is True:
-        sql = "UPDATE api_constraints SET reviewed=True, changed=True WHERE id='{id}'".format(id=id)
+
+def _apply_queued_changes(ids, get_change, change_table, success_sql,
+                          failure_sql):
+    """
+    Applies queued changes on one connection. Every change runs in its own
+    savepoint, so a failing change is recorded without reverting the others.
+    Changes see the columns as left by the changes before them.
+    The review state of all changes is updated at the end of the transaction.
+    """
+
+    ids = [int(i) for i in ids]
+    results = {}
+
+    connection = _get_engine().connect()
+    transaction = connection.begin()
+    try:
+        for id in ids:
+            savepoint = connection.begin_nested()
+            try:
+                res = change_table(get_change(id), connection=connection)
+            except APIError as e:
+                savepoint.rollback()
+                res = get_response_dict(False, e.status, e.message,
+                                        exception=e.message)
+            else:
+                if res.get('success') is True:
+                    savepoint.commit()
+                else:
+                    savepoint.rollback()
+            results[id] = res
+
+        applied = [id for id, res in results.items()
+                   if res.get('success') is True]
+        failed = [{'id': id,
+                   'exception': str(res.get('exception') or res.get('error')
+                                    or 'The change could not be applied.')}
+                  for id, res in results.items()
+                  if res.get('success') is not True]
+        if applied:
+            connection.execute(success_sql, {'ids': applied})
+        if failed:
+            connection.execute(failure_sql, failed)
+    except Exception:
+        transaction.rollback()
+        raise
     else:
-        ex_str = str(res.get('exception'))
-        sql = "UPDATE api_constraints SET reviewed=False, changed=False, exception={ex_str} WHERE id='{id}'".format(
-            id=id, ex_str=ex_str)
-    perform_sql(sql)
-    return res
+        transaction.commit()
+    finally:
+        connection.close()
+        # Cleared only now, so that no other request caches the
+        # definitions from before the commit.
+        clear_describe_cache()
+        clear_change_cache()
+
+    return results
 
 
 def remove_queued_constraint(id):
@@ -335,8 +678,12 @@ def remove_queued_constraint(id):
     :return:
     """
 
-    sql = "UPDATE api_constraints SET reviewed=True WHERE id='{id}'".format(id=id)
-    perform_sql(sql)
+    perform_sql(_remove_constraint_sql, {'id': id})
+    clear_change_cache()
+
+
+# Line breaks are flattened out of error messages in a single pass
+_NL_CR_TABLE = str.maketrans({'\n': ' ', '\r': ' '})
 
 
 def get_response_dict(success, http_status_code=200, reason=None, exception=None, result=None):
@@ -349,7 +696,7 @@ def get_response_dict(success, http_status_code=200, reason=None, exception=None
     :return: Dictionary with results
     """
     dict = {'success': success,
-            'error': str(reason).replace('\n', ' ').replace('\r', ' ') if reason is not None else None,
+            'error': str(reason).translate(_NL_CR_TABLE) if reason is not None else None,
             'http_status': http_status_code,
             'exception': exception,
             'result': result
@@ -366,21 +713,22 @@ def queue_constraint_change(schema, table, constraint_def):
     :return: Result of database command
     """
 
-    cd = api.parser.replace_None_with_NULL(constraint_def)
-
-    sql_string = "INSERT INTO public.api_constraints (action, constraint_type" \
-                 ", constraint_name, constraint_parameter, reference_table, reference_column, c_schema, c_table) " \
-                 "VALUES ('{action}', '{c_type}', '{c_name}', '{c_parameter}', '{r_table}', '{r_column}' , '{c_schema}' " \
-                 ", '{c_table}');".format(action=get_or_403(cd, 'action'),
-                                          c_type=get_or_403(cd, 'constraint_type'),
-                                          c_name=get_or_403(cd, 'constraint_name'),
-                                          c_parameter=get_or_403(cd, 'constraint_parameter'),
-                                          r_table=get_or_403(cd, 'reference_table'),
-                                          r_column=get_or_403(cd, 'reference_column'),
-                                          c_schema=schema,
-                                          c_table=table).replace('\'NULL\'', 'NULL')
-
-    return perform_sql(sql_string)
+    action, c_type, c_name, c_parameter, r_table, r_column = (
+        get_or_403(constraint_def, key) for key in (
+            'action', 'constraint_type', 'constraint_name',
+            'constraint_parameter', 'reference_table', 'reference_column'))
+
+    result = perform_sql(_queue_constraint_sql,
+                         {'action': action,
+                          'c_type': c_type,
+                          'c_name': c_name,
+                          'c_parameter': c_parameter,
+                          'r_table': r_table,
+                          'r_column': r_column,
+                          'c_schema': schema,
+                          'c_table': table})
+    clear_change_cache()
+    return result
 
 
 def queue_column_change(schema, table, column_definition):
@@ -392,18 +740,60 @@ def queue_column_change(schema, table, column_definition):
     :return: Result of database command
     """
 
-    column_definition = api.parser.replace_None_with_NULL(column_definition)
+    name, not_null, data_type, new_name = (
+        get_or_403(column_definition, key) for key in (
+            'column_name', 'not_null', 'data_type', 'new_name'))
+
+    result = perform_sql(_queue_column_sql,
+                         {'name': name,
+                          'not_null': not_null,
+                          'data_type': data_type,
+                          'new_name': new_name,
+                          'c_schema': schema,
+                          'c_table': table})
+    clear_change_cache()
+    return result
 
-    sql_string = "INSERT INTO public.api_columns (column_name, not_null, data_type, new_name, c_schema, c_table) " \
-                 "VALUES ('{name}','{not_null}','{data_type}','{new_name}','{c_schema}','{c_table}');" \
-        .format(name=get_or_403(column_definition, 'column_name'),
-                not_null=get_or_403(column_definition, 'not_null'),
-                data_type=get_or_403(column_definition, 'data_type'),
-                new_name=get_or_403(column_definition, 'new_name'),
-                c_schema=schema,
-                c_table=table).replace('\'NULL\'', 'NULL')
 
-    return perform_sql(sql_string)
+_get_column_change_sql = sqla.text(
+    "SELECT column_name, not_null, data_type, new_name, reviewed, changed, "
+    "c_schema, c_table, id, exception "
+    "FROM public.api_columns WHERE id=:id;")
+_get_constraint_change_sql = sqla.text(
+    "SELECT action, constraint_type, constraint_name, constraint_parameter, "
+    "reference_table, reference_column, reviewed, changed, c_schema, "
+    "c_table, id, exception "
+    "FROM public.api_constraints WHERE id=:id;")
+
+
+def _column_change_from_row(column):
+    return {'column_name': column.column_name,
+            'not_null': column.not_null,
+            'data_type': column.data_type,
+            'new_name': column.new_name,
+            'reviewed': column.reviewed,
+            'changed': column.changed,
+            'c_schema': column.c_schema,
+            'c_table': column.c_table,
+            'id': column.id,
+            'exception': column.exception
+            }
+
+
+def _constraint_change_from_row(column):
+    return {'action': column.action,
+            'constraint_type': column.constraint_type,
+            'constraint_name': column.constraint_name,
+            'constraint_parameter': column.constraint_parameter,
+            'reference_table': column.reference_table,
+            'reference_column': column.reference_column,
+            'reviewed': column.reviewed,
+            'changed': column.changed,
+            'c_schema': column.c_schema,
+            'c_table': column.c_table,
+            'id': column.id,
+            'exception': column.exception
+            }
 
 
 def get_column_change(i_id):
@@ -412,12 +802,10 @@ def get_column_change(i_id):
     :param i_id: ID of Change
     :return: Change or None, if no change found
     """
-    all_changes = get_column_changes()
-    for change in all_changes:
-        if int(change.get('id')) == int(i_id):
-            return change
+    with _get_engine().connect() as connection:
+        row = connection.execute(_get_column_change_sql, {'id': int(i_id)}).first()
 
-    return None
+    return _column_change_from_row(row) if row is not None else None
 
 
 def get_constraint_change(i_id):
@@ -426,132 +814,112 @@ def get_constraint_change(i_id):
     :param i_id: ID of Change
     :return: Change or None, if no change found
     """
-    all_changes = get_constraints_changes()
+    with _get_engine().connect() as connection:
+        row = connection.execute(_get_constraint_change_sql, {'id': int(i_id)}).first()
 
-    for change in all_changes:
-        if int(change.get('id')) == int(i_id):
-            return change
+    return _constraint_change_from_row(row) if row is not None else None
 
-    return None
 
+# Filters that can be applied to the change queues, given as the name of the
+# bind parameter and the corresponding condition
+_CHANGE_FILTERS = (('reviewed', 'reviewed = :reviewed'),
+                   ('changed', 'changed = :changed'),
+                   ('schema', 'c_schema = :schema'),
+                   ('table', 'c_table = :table'))
 
-def get_column_changes(reviewed=None, changed=None, schema=None, table=None):
+
+def _build_change_queries(source):
     """
-    Get all column changes
-    :param reviewed: Reviewed Changes
-    :param changed: Applied Changes
-    :return: List with Column Definitions
+    Prepares one query on `source` for every combination of filters in
+    `_CHANGE_FILTERS`. The queries are identified by a tuple of booleans
+    indicating which filters are used.
     """
+    queries = {}
+    for mask in itertools.product((False, True), repeat=len(_CHANGE_FILTERS)):
+        where = [condition for (_, condition), used
+                 in zip(_CHANGE_FILTERS, mask) if used]
+        query = "SELECT * FROM " + source
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        queries[mask] = sqla.text(query + ";")
+    return queries
 
-    engine = _get_engine()
-    session = sessionmaker(bind=engine)()
-    query = ["SELECT * FROM public.api_columns"]
 
-    if reviewed is not None or changed is not None or schema is not None or table is not None:
-        query.append(" WHERE ")
+_COLUMN_CHANGE_QUERIES = _build_change_queries('public.api_columns')
+_CONSTRAINT_CHANGE_QUERIES = _build_change_queries('public.api_constraints')
 
-        where = []
 
-        if reviewed is not None:
-            where.append("reviewed = " + str(reviewed))
+def _change_filters(*values):
+    mask = tuple(value is not None for value in values)
+    params = {name: value for (name, _), value in zip(_CHANGE_FILTERS, values)
+              if value is not None}
+    return mask, params
 
-        if changed is not None:
-            where.append("changed = " + str(changed))
 
-        if schema is not None:
-            where.append("c_schema = '{schema}'".format(schema=schema))
+_CHANGE_SOURCES = {
+    'column': (_COLUMN_CHANGE_QUERIES, _column_change_from_row),
+    'constraint': (_CONSTRAINT_CHANGE_QUERIES, _constraint_change_from_row),
+}
 
-        if table is not None:
-            where.append("c_table = '{table}'".format(table=table))
+# Listings of the change queues are kept for a few seconds and dropped
+# whenever a queue is changed through this module.
+_CHANGE_CACHE_TTL = 5
 
-        query.append(" AND ".join(where))
 
-    query.append(";")
+@functools.lru_cache(maxsize=32)
+def _cached_changes(kind, mask, params, bucket):
+    queries, from_row = _CHANGE_SOURCES[kind]
+    with _get_engine().connect() as connection:
+        response = connection.execute(queries[mask], dict(params)).fetchall()
+    return [from_row(column) for column in response]
 
-    sql = ''.join(query)
 
-    response = session.execute(sql)
-    session.close()
+def _get_changes(kind, *filters):
+    mask, params = _change_filters(*filters)
+    changes = _cached_changes(kind, mask, tuple(params.items()),
+                              _cache_bucket(_CHANGE_CACHE_TTL))
+    # Callers are free to modify the returned changes
+    return [dict(change) for change in changes]
 
-    return [{'column_name': column.column_name,
-             'not_null': column.not_null,
-             'data_type': column.data_type,
-             'new_name': column.new_name,
-             'reviewed': column.reviewed,
-             'changed': column.changed,
-             'c_schema': column.c_schema,
-             'c_table': column.c_table,
-             'id': column.id,
-             'exception': column.exception
-             } for column in response]
+
+def clear_change_cache():
+    """
+    Drops all cached listings of the change queues. Has to be called after
+    a queue was modified.
+    """
+    _cached_changes.cache_clear()
 
 
-def get_constraints_changes(reviewed=None, changed=None, schema=None, table=None):
+def get_column_changes(reviewed=None, changed=None, schema=None, table=None):
     """
-    Get all constraint changes
+    Get all column changes
     :param reviewed: Reviewed Changes
     :param changed: Applied Changes
-    :return: List with Column Definitons
+    :return: List with Column Definitions
     """
-    engine = _get_engine()
-    session = sessionmaker(bind=engine)()
-    query = ["SELECT * FROM public.api_constraints"]
-
-    if reviewed is not None or changed is not None or schema is not None or table is not None:
-        query.append(" WHERE ")
 
-        where = []
+    return _get_changes('column', reviewed, changed, schema, table)
 
-        if reviewed is not None:
-            where.append("reviewed = " + str(reviewed))
 
-        if changed is not None:
-            where.append("changed = " + str(changed))
-
-        if schema is not None:
-            where.append("c_schema = '{schema}'".format(schema=schema))
-
-        if table is not None:
-            where.append("c_table = '{table}'".format(table=table))
-
-        query.append(" AND ".join(where))
-
-    query.append(";")
-
-    sql = ''.join(query)
-
-    response = session.execute(sql)
-    session.close()
-
-    return [{'action': column.action,
-             'constraint_type': column.constraint_type,
-             'constraint_name': column.constraint_name,
-             'constraint_parameter': column.constraint_parameter,
-             'reference_table': column.reference_table,
-             'reference_column': column.reference_column,
-             'reviewed': column.reviewed,
-             'changed': column.changed,
-             'c_schema': column.c_schema,
-             'c_table': column.c_table,
-             'id': column.id,
-             'exception': column.exception
-             } for column in response]
+def get_constraints_changes(reviewed=None, changed=None, schema=None, table=None):
+    """
+    Get all constraint changes
+    :param reviewed: Reviewed Changes
+    :param changed: Applied Changes
+    :return: List with Column Definitons
+    """
+    return _get_changes('constraint', reviewed, changed, schema, table)
 
 
 def get_column_definition_query(c):
-    return "{name} {data_type} {length} {not_null} {default}".format(
-        name=get_or_403(c, 'name'),
-        data_type=get_or_403(c, 'data_type'),
-        length=('(' + str(c['character_maximum_length']) + ')')
-                    if c.get('character_maximum_length', False)
-                    else '',
-        not_null="NOT NULL"
-                    if not c.get('is_nullable', True)
-                    else "",
-        default= 'DEFAULT ' + api.parser.read_pgvalue(c['column_default'])
-                    if 'column_default' in c
-                    else ""
-        )
+    name = get_or_403(c, 'name')
+    data_type = get_or_403(c, 'data_type')
+    length = c.get('character_maximum_length', False)
+    length = f"({length})" if length else ''
+    not_null = '' if c.get('is_nullable', True) else ' NOT NULL'
+    default = (' DEFAULT ' + api.parser.read_pgvalue(c['column_default'])
+               if 'column_default' in c else '')
+    return f"{name} {data_type}{length}{not_null}{default}"
 
 
 def column_alter(query, context, schema, table, column):
@@ -584,23 +952,22 @@ def column_alter(query, context, schema, table, column):
             column=column
         )
         perform_sql(sql)
+    clear_describe_cache()
     return get_response_dict(success=True)
 
 def column_add(schema, table, column, description):
     description['name'] = column
     settings = get_column_definition_query(description)
-    s = 'ALTER TABLE {schema}.{table} ADD COLUMN ' + settings
+    s = 'ALTER TABLE {schema}.{table} ADD COLUMN ' + settings + ';'
     edit_table = get_edit_table_name(schema, table)
     insert_table = get_insert_table_name(schema, table)
-    perform_sql(s.format(schema=schema, table=table))
-    # Do the same for update and insert tables.
-    meta_schema = get_meta_schema_name(schema)
-    perform_sql(s.format(schema=meta_schema,
-                         table=edit_table))
-
     meta_schema = get_meta_schema_name(schema)
-    perform_sql(s.format(schema=meta_schema,
-                         table=insert_table))
+    # Do the same for update and insert tables. All statements are sent at
+    # once and committed in one transaction.
+    perform_sql(''.join([s.format(schema=schema, table=table),
+                         s.format(schema=meta_schema, table=edit_table),
+                         s.format(schema=meta_schema, table=insert_table)]))
+    clear_describe_cache()
     return get_response_dict(success=True)
 
 
@@ -617,22 +984,29 @@ def table_create(schema, table, columns, constraints):
     # Building and joining a string array seems to be more efficient than native string concats.
     # https://waymoot.org/home/python_string/
 
-    id_columns = [c for c in columns if c['name'] == 'id']
-    if not id_columns:
+    # The column definitions are built and the id column is validated in a
+    # single pass over the columns.
+    column_definitions = []
+    has_id = False
+    for c in columns:
+        if not has_id and get_or_403(c, 'name') == 'id':
+            if not get_or_403(c, 'data_type').lower() == 'bigserial':
+                raise APIError('Your column "id" must have type "bigserial"')
+            has_id = True
+        column_definitions.append(get_column_definition_query(c))
+    if not has_id:
         raise APIError('Your table must have one column "id" of type "bigserial"')
-    cid = id_columns[0]
-    if not get_or_403(cid, 'data_type').lower() == 'bigserial':
-        raise APIError('Your column "id" must have type "bigserial"')
+
     str_list = []
     str_list.append("CREATE TABLE {schema}.\"{table}\" (".format(schema=schema, table=table))
 
-    str_list.append(', '.join(get_column_definition_query(c) for c in columns))
+    str_list.append(', '.join(column_definitions))
 
     str_list.append(");")
     sql_string = ''.join(str_list)
 
-
     results = [perform_sql(sql_string)]
+    clear_describe_cache()
 
     for constraint_definition in constraints:
         results.append(table_change_constraint(constraint_definition))
@@ -644,12 +1018,14 @@ def table_create(schema, table, columns, constraints):
     return get_response_dict(success=True)
 
 
-def table_change_column(column_definition):
+def table_change_column(column_definition, connection=None):
     """
     Changes a table column.
     :param schema: schema
     :param table: table
     :param column_definition: column definition according to Issue #184
+    :param connection: Connection to execute the changes on (see
+        :meth:`perform_sql`)
     :return: Dictionary with results
     """
 
@@ -657,7 +1033,8 @@ def table_change_column(column_definition):
     table = get_or_403(column_definition, 'c_table')
 
     # Check if column exists
-    existing_column_description = describe_columns(schema, table)
+    existing_column_description = describe_columns(schema, table,
+                                                   connection=connection)
 
     if len(existing_column_description) <= 0:
         return get_response_dict(False, 400, 'table is not defined.')
@@ -666,27 +1043,30 @@ def table_change_column(column_definition):
     sql = []
 
     start_name = get_or_403(column_definition, 'column_name')
-    current_name = get_or_403(column_definition, 'column_name')
+    current_name = start_name
 
     if current_name in existing_column_description:
         # Column exists and want to be changed
 
         # Figure out, which column should be changed and constraint or datatype or name should be changed
 
-        if get_or_403(column_definition, 'new_name') is not None:
+        new_name = get_or_403(column_definition, 'new_name')
+        if new_name is not None:
             # Rename table
             sql.append(
                 "ALTER TABLE {schema}.{table} RENAME COLUMN {name} TO {new_name};".format(schema=schema, table=table,
                                                                                           name=current_name,
-                                                                                          new_name=column_definition[
-                                                                                              'new_name']))
+                                                                                          new_name=new_name))
             # All other operations should work with new name
-            current_name = column_definition['new_name']
+            current_name = new_name
 
+        existing_column = existing_column_description[start_name]
+
+        # Only issue statements for properties that actually change: Each
+        # ALTER TABLE locks the whole table.
         cdef_datatype = column_definition.get('data_type')
         # TODO: Fix rudimentary handling of datatypes
-        if cdef_datatype is not None and cdef_datatype != existing_column_description[column_definition['name']][
-            'data_type']:
+        if cdef_datatype is not None and cdef_datatype != existing_column['data_type']:
             sql.append("ALTER TABLE {schema}.{table} ALTER COLUMN {c_name} TYPE {c_datatype};".format(schema=schema,
                                                                                                       table=table,
                                                                                                       c_name=current_name,
@@ -694,7 +1074,7 @@ def table_change_column(column_definition):
                                                                                                       column_definition[
                                                                                                           'data_type']))
 
-        c_null = 'NO' in existing_column_description[start_name]['is_nullable']
+        c_null = not existing_column['is_nullable']
         cdef_null = column_definition.get('not_null');
         if cdef_null is not None and c_null != cdef_null:
             if c_null:
@@ -717,24 +1097,35 @@ def table_change_column(column_definition):
                                                                                                                'data_type'),
                                                                                          c_notnull="NOT NULL" if column_definition.get('notnull', False) else ""))
 
+    if not sql:
+        # The column is already in the requested state
+        return get_response_dict(success=True)
+
     sql_string = ''.join(sql)
 
-    return perform_sql(sql_string)
+    result = perform_sql(sql_string, connection=connection)
+    if connection is None:
+        # Otherwise the caller clears the cache once it has committed.
+        clear_describe_cache()
+    return result
 
 
-def table_change_constraint(constraint_definition):
+def table_change_constraint(constraint_definition, connection=None):
     """
     Changes constraint of table
     :param schema: schema
     :param table: table
     :param constraint_definition: constraint definition according to Issue #184
+    :param connection: Connection to execute the changes on (see
+        :meth:`perform_sql`)
     :return: Dictionary with results
     """
 
     table = get_or_403(constraint_definition, 'c_table')
     schema = get_or_403(constraint_definition, 'c_schema')
 
-    existing_column_description = describe_columns(schema, table)
+    existing_column_description = describe_columns(schema, table,
+                                                   connection=connection)
 
     if len(existing_column_description) <= 0:
         raise APIError('Table does not exist')
@@ -742,24 +1133,29 @@ def table_change_constraint(constraint_definition):
     # There is a table named schema.table.
     sql = []
 
-    if 'ADD' in get_or_403(constraint_definition, 'action'):
+    action = get_or_403(constraint_definition, 'action')
+
+    if 'ADD' in action:
+        constraint_type = get_or_403(constraint_definition, 'constraint_type')
         sql.append(
             'ALTER TABLE {schema}.{table} {action} {constraint_name} {constraint_type} ({constraint_parameter})'.format(
                 schema=schema, table=table,
-                action=get_or_403(constraint_definition, 'action'),
+                action=action,
                 constraint_name = 'CONSTRAINT ' + constraint_definition['constraint_name'] if 'constraint_name' in constraint_definition else '',
                 constraint_parameter = get_or_403(constraint_definition, 'constraint_parameter'),
-                constraint_type = get_or_403(constraint_definition, 'constraint_type')))
+                constraint_type = constraint_type))
 
-        if 'FOREIGN KEY' in get_or_403(constraint_definition, 'constraint_type'):
-            if get_or_403(constraint_definition, 'reference_table') is None or get_or_403(constraint_definition, 'reference_column') is None:
+        if 'FOREIGN KEY' in constraint_type:
+            reference_table = get_or_403(constraint_definition, 'reference_table')
+            reference_column = get_or_403(constraint_definition, 'reference_column')
+            if reference_table is None or reference_column is None:
                 raise APIError('references are not defined correctly')
             sql.append(' REFERENCES {reference_table}({reference_column})'.format(
-                reference_column=constraint_definition['reference_column'],
-                reference_table=constraint_definition['reference_table']))
+                reference_column=reference_column,
+                reference_table=reference_table))
 
         sql.append(';')
-    elif 'DROP' in constraint_definition['action']:
+    elif 'DROP' in action:
         sql.append('ALTER TABLE {schema}.{table} DROP CONSTRAINT {constraint_name}'.format(schema=schema, table=table,
                                                                                            constraint_name=
                                                                                            constraint_definition[
@@ -767,20 +1163,58 @@ def table_change_constraint(constraint_definition):
 
     sql_string = ''.join(sql)
 
-    return perform_sql(sql_string)
+    result = perform_sql(sql_string, connection=connection)
+    if connection is None:
+        # Otherwise the caller clears the cache once it has committed.
+        clear_describe_cache()
+    return result
+
 
+# Number of rows sent per INSERT statement by `execute_values`
+_INSERT_PAGE_SIZE = 1000
 
-def put_rows(schema, table, column_data):
-    keys = list(column_data.keys())
-    values = list(column_data.values())
 
-    values = ["'{0}'".format(value) for value in values]
+def put_rows(schema, table, rows):
+    """
+    Inserts rows into a table. All rows are sent in pages of
+    `_INSERT_PAGE_SIZE` rows per statement.
+    :param schema: schema
+    :param table: table
+    :param rows: List of dictionaries that map column names to values. All
+        rows must contain the same columns. A single dictionary is treated as
+        list containing only this row.
+    :return: Dictionary with results
+    """
+    if isinstance(rows, dict):
+        rows = [rows]
+    if not rows:
+        return get_response_dict(success=True)
 
-    sql = "INSERT INTO {schema}.{table} ({keys}) VALUES({values})".format(schema=schema, table=table,
-                                                                          keys=','.join(keys),
-                                                                          values=','.join(values))
+    keys = list(rows[0].keys())
+    if any(row.keys() != rows[0].keys() for row in rows):
+        raise APIError('All rows must contain the same columns')
 
-    return perform_sql(sql)
+    sql = "INSERT INTO {schema}.{table} ({keys}) VALUES %s".format(
+        schema=read_pgid(schema), table=read_pgid(table),
+        keys=','.join(read_pgid(key) for key in keys))
+
+    connection = _get_engine().raw_connection()
+    try:
+        cursor = connection.cursor()
+        psycopg2.extras.execute_values(
+            cursor, sql, [tuple(row[key] for key in keys) for row in rows],
+            page_size=_INSERT_PAGE_SIZE)
+        cursor.close()
+    except psycopg2.Error as e:
+        print("SQL Action failed. \n Error:\n" + str(e))
+        connection.rollback()
+        raise APIError(str(e))
+    else:
+        connection.commit()
+    finally:
+        connection.close()
+
+    return get_response_dict(success=True)
 
 
 """
@@ -788,28 +1222,21 @@ ACTIONS FROM OLD API
 """
 
 
-def _get_table(schema, table):
+@functools.lru_cache(maxsize=256)
+def _reflect_table(schema, table, bucket):
     engine = _get_engine()
     metadata = MetaData(bind=_get_engine())
 
     return Table(table, metadata, autoload=True, autoload_with=engine, schema=schema)
 
 
-def __internal_select(query, context):
-    engine = _get_engine()
-    conn = engine.connect()
-    try:
-        cursor = conn.connection.cursor()
-        cursor_id = cursor.__hash__
-        __CURSORS[cursor_id] = cursor
-        context2 = dict(context)
-        context2['cursor_id'] = cursor_id
-        rows = data_search(query, context2)
-        rows['data'] = [x for x in cursor.fetchall()]
-        cursor.close()
-    finally:
-        conn.close()
-    return rows
+def _get_table(schema, table):
+    """
+    Returns the reflected table `schema.table`. Reflected tables are cached
+    like the table descriptions (see :meth:`clear_describe_cache`) and must
+    not be modified by the caller.
+    """
+    return _reflect_table(schema, table, _cache_bucket(_DESCRIBE_CACHE_TTL))
 
 
 def __change_rows(request, context, target_table, setter, fields=None):
@@ -827,45 +1254,71 @@ def __change_rows(request, context, target_table, setter, fields=None):
 
     user = context['user'].name
 
-    rows = __internal_select(query, context)
+    # The affected rows are streamed through a server-side cursor on the
+    # connection of this request, so that they never have to be held in
+    # memory at once.
+    cursor = _load_cursor(context['cursor_id'])
+    select_cursor = cursor.connection.cursor(
+        name='change_rows_' + secrets.token_hex(8))
+    try:
+        _execute_sqla(api.parser.parse_select(query), select_cursor)
+        chunk = select_cursor.fetchmany(_FETCH_BATCH_SIZE)
 
-    message = request.get('message', None)
-    meta_fields = list(api.parser.set_meta_info('update', user, message).items())
-    if fields is None:
-        fields = [field[0] for field in rows['description']]
-    fields += [f[0] for f in meta_fields]
+        message = request.get('message', None)
+        meta_fields = list(api.parser.set_meta_info('update', user, message).items())
+        if fields is None:
+            fields = [field[0] for field in select_cursor.description]
+        fields += [f[0] for f in meta_fields]
 
-    table_name = request['table']
-    meta = MetaData(bind=_get_engine())
-    table = Table(table_name, meta, autoload=True, schema=request['schema'])
-    pks = [c for c in table.columns if c.primary_key]
+        table = _get_table(request['schema'], request['table'])
+        pks = [c for c in table.columns if c.primary_key]
 
-    inserts = []
-    cursor = _load_cursor(context['cursor_id'])
-    if rows['data']:
-        for row in rows['data']:
-            insert = []
-            for (key, value) in list(zip(fields, row)) + meta_fields:
-                if not api.parser.is_pg_qual(key):
-                    raise APIError('%s is not a PostgreSQL identifier'%key)
-                if key in setter:
-                    if not (key in pks and value != setter[key]):
-                        value = setter[key]
-                    else:
-                        raise InvalidRequest(
-                            "Primary keys must remain unchanged.")
-                insert.append((key, value))
-
-            inserts.append(dict(insert))
         # Add metadata for insertions
         schema = request['schema']
-        meta_schema = get_meta_schema_name(schema) if not schema.startswith(
-            '_') else schema
-
-        insert_table = _get_table(meta_schema, target_table)
-        query = insert_table.insert(values=inserts)
-        _execute_sqla(query, cursor)
-    return {'affected':len(rows['data'])}
+        meta_schema = schema if schema.startswith('_') else get_meta_schema_name(schema)
+
+        # Everything that does not depend on the single row is prepared
+        # once: the identifiers are validated, the statement is built and
+        # the positions the setter overrides are looked up.
+        for key in fields:
+            if not api.parser.is_pg_qual(key):
+                raise APIError('%s is not a PostgreSQL identifier'%key)
+        pk_names = {c.name for c in pks}
+        overrides = [(i, setter[key]) for i, key in enumerate(fields)
+                     if key in setter and key not in pk_names]
+        pk_checks = [(i, setter[key]) for i, key in enumerate(fields)
+                     if key in setter and key in pk_names]
+        meta_values = [value for _, value in meta_fields]
+        sql = 'INSERT INTO "{schema}"."{table}" ({keys}) VALUES %s'.format(
+            schema=meta_schema, table=target_table,
+            keys=', '.join('"%s"' % key for key in fields))
+
+        affected = 0
+        while chunk:
+            inserts = []
+            for row in chunk:
+                insert = list(row)
+                insert.extend(meta_values)
+                for i, value in pk_checks:
+                    if insert[i] != value:
+                        raise APIError(
+                            "Primary keys must remain unchanged.",
+                            status=409)
+                for i, value in overrides:
+                    insert[i] = value
+                inserts.append(insert)
+
+            # The changes are sent in pages of multi-row INSERT statements.
+            try:
+                psycopg2.extras.execute_values(cursor, sql, inserts,
+                                               page_size=_INSERT_PAGE_SIZE)
+            except (psycopg2.DataError, psycopg2.IntegrityError) as e:
+                raise APIError(repr(e))
+            affected += len(chunk)
+            chunk = select_cursor.fetchmany(_FETCH_BATCH_SIZE)
+    finally:
+        select_cursor.close()
+    return {'affected': affected}
 
 
 def data_delete(request, context=None):
@@ -879,77 +1332,121 @@ def data_update(request, context=None):
     setter = get_or_403(request, 'values')
     return __change_rows(request, context, target_table, setter)
 
+_insert_check_constraints_sql = sqla.text(
+    'SELECT array_agg(column_name::text) as columns, conname, '
+    '   contype AS type '
+    'FROM pg_constraint AS conkeys '
+    'JOIN information_schema.constraint_column_usage AS ccu '
+    '   ON ccu.constraint_name = conname '
+    'WHERE table_name = :table '
+    '   AND table_schema = :schema '
+    '   AND conrelid = (:schema || \'.\' || :table)::regclass::oid '
+    'GROUP BY conname, contype;')
+
+
+@functools.lru_cache(maxsize=512)
+def _insert_check_constraints(schema, table, bucket):
+    """
+    Loads the constraints `data_insert_check` validates as tuples of
+    column names, constraint name and constraint type. Results are cached
+    like the table descriptions (see :meth:`clear_describe_cache`).
+    """
+    session = Session()
+    try:
+        return tuple((tuple(constraint.columns), constraint.conname,
+                      constraint.type.lower())
+                     for constraint in session.execute(
+                         _insert_check_constraints_sql,
+                         {'schema': schema, 'table': table}))
+    finally:
+        session.close()
+
+
 def data_insert_check(schema, table, values, context):
 
-    engine = _get_engine()
-    session = sessionmaker(bind=engine)()
-    query = 'SELECT array_agg(column_name::text) as columns, conname, ' \
-            '   contype AS type ' \
-            'FROM pg_constraint AS conkeys ' \
-            'JOIN information_schema.constraint_column_usage AS ccu ' \
-            '   ON ccu.constraint_name = conname ' \
-            'WHERE table_name=\'{table}\' ' \
-            '   AND table_schema=\'{schema}\' ' \
-            '   AND conrelid=\'{schema}.{table}\'::regclass::oid ' \
-            'GROUP BY conname, contype;'.format(
-        table=table, schema=schema)
-    response = session.execute(query)
-    session.close()
-
-    for constraint in response:
-        columns = constraint.columns
-        if constraint.type.lower() == 'c':
+    constraints = _insert_check_constraints(schema, table,
+                                            _cache_bucket(_DESCRIBE_CACHE_TTL))
+    column_descriptions = describe_columns(schema, table)
+
+    # Every unique and primary key constraint contributes one branch to a
+    # single query that returns the colliding keys of all constraints.
+    t = None
+    checks = []
+    for columns, conname, contype in constraints:
+        if contype == 'c':
             pass
-        elif constraint.type.lower() == 'f':
+        elif contype == 'f':
             pass
-        elif constraint.type.lower() in ['u', 'p']:
-            for row in values:
-                query = {
-                    'from':
-                        {
-                            'type': 'table',
-                            'schema': schema,
-                            'table': table
-                        },
-                    'where':
-                        {
-                            'type': 'operator',
-                            'operator': 'AND',
-                            'operands':
-                                [{
-                                    'operands': [
-                                        {
-                                            'type': 'column',
-                                            'column': c
-                                        },
-                                        {
-                                            'type': 'value',
-                                            'value': _load_value(row[c])
-                                        } if c in row else {'type': 'value'}],
-                                    'operator': '=',
-                                    'type': 'operator'
-                                } for c in columns]
-                        },
-                    'fields': [{'type': 'column',
-                                    'column': f} for f in columns]
-                }
-                rows =__internal_select(query, context)
-                if rows['data']:
-                    raise APIError('Action violates constraint {cn}. Failing row was {row}'.format(cn=constraint.conname, row='(' + (', '.join(str(row[c]) for c in row if not c.startswith('_')))) + ')')
-
-    for column_name, column in describe_columns(schema, table).items():
-        if not column.get('is_nullable', True):
-            for row in values:
-                val = row.get(column_name, None)
-                if (val is None
-                    or (isinstance(val, str)
-                        and val.lower() == 'null')):
-                    if column_name in row or not column.get('column_default', None):
-                        raise APIError(
-                            'Action violates not-null constraint on {col}. Failing row was {row}'.format(
-                                col=column_name, row='(' + (', '.join(
-                                    str(row[c]) for c in row if
-                                    not c.startswith('_')))) + ')')
+        elif contype in ['u', 'p']:
+            # Rows that leave a key column empty compare as NULL and can not
+            # collide.
+            # Only values of integer columns are converted. Everything else
+            # is passed on as is and cast by the database.
+            coercers = [_load_value
+                        if column_descriptions.get(c, {}).get('data_type') in _INTEGER_TYPES
+                        else None
+                        for c in columns]
+            candidates = [(tuple(row[c] if coerce is None else coerce(row[c])
+                                 for c, coerce in zip(columns, coercers)), row)
+                          for row in values
+                          if all(row.get(c) is not None for c in columns)]
+            if not candidates:
+                continue
+            if t is None:
+                t = _get_table(schema, table)
+            key_columns = [t.c[c] for c in columns]
+            # Keys are returned as text arrays, so that branches over
+            # columns of different number and type can be united.
+            checks.append((conname, candidates, sqla.select([
+                sqla.literal(conname).label('conname'),
+                postgresql.array([sqla.cast(c, sqla.Text)
+                                  for c in key_columns]).label('key')
+            ]).where(sqla.tuple_(*key_columns).in_(
+                [key for key, _ in candidates]))))
+
+    if checks:
+        query = (sqla.union_all(*(check for _, _, check in checks))
+                 if len(checks) > 1 else checks[0][2])
+        with _get_engine().connect() as connection:
+            existing = connection.execute(query).fetchall()
+        existing_keys = {}
+        for conname, key in existing:
+            existing_keys.setdefault(conname, set()).add(tuple(key))
+        for conname, candidates, _ in checks:
+            if conname not in existing_keys:
+                continue
+            keys = existing_keys[conname]
+            failing = next((row for key, row in candidates
+                            if tuple(map(str, key)) in keys), None)
+            if failing is None:
+                failing_row = '(' + ', '.join(next(iter(keys))) + ')'
+            else:
+                failing_row = '(' + (', '.join(str(failing[c]) for c in failing if not c.startswith('_'))) + ')'
+            raise APIError('Action violates constraint {cn}. Failing row was {row}'.format(cn=conname, row=failing_row))
+
+    # Non-nullable columns and whether they may be omitted because they
+    # have a default value. Both are determined once for all rows.
+    not_null_columns = [(column_name, bool(column.get('column_default', None)))
+                        for column_name, column
+                        in column_descriptions.items()
+                        if not column.get('is_nullable', True)]
+    for row in values:
+        for column_name, has_default in not_null_columns:
+            val = row.get(column_name, None)
+            if val is None:
+                if has_default and column_name not in row:
+                    continue
+            elif not (isinstance(val, str) and val.lower() == 'null'):
+                continue
+            raise APIError(
+                'Action violates not-null constraint on {col}. Failing row was {row}'.format(
+                    col=column_name, row='(' + (', '.join(
+                        str(row[c]) for c in row if
+                        not c.startswith('_')))) + ')')
+
+
+_INTEGER_TYPES = frozenset({'smallint', 'integer', 'bigint'})
+
 
 def _load_value(v):
     if isinstance(v,str):
@@ -985,7 +1482,9 @@ def data_insert(request, context=None):
 
 def _execute_sqla(query, cursor):
     try:
-        compiled = query.compile()
+        # Compiling for the engine's dialect directly spares looking up the
+        # bind of the statement's tables.
+        compiled = query.compile(dialect=_get_engine().dialect)
     except exc.SQLAlchemyError as e:
         raise APIError(repr(e))
     try:
@@ -1060,7 +1559,7 @@ def table_drop(request, context=None):
         option=option if option else "",
         exists="IF EXISTS" if exists else "")
 
-    session = sessionmaker(bind=engine)()
+    session = Session()
     try:
         session.execute(sql_string.replace('%', '%%'))
     except Exception as e:
@@ -1092,13 +1591,29 @@ def _get_count(q):
     return count
 
 
+_estimate_count_sql = sqla.text(
+    "SELECT reltuples::bigint FROM pg_class "
+    "WHERE oid = (:schema || '.' || :table)::regclass;")
+
+
 def count_all(request, context=None):
+    """
+    Counts the rows of a table. If `approximate` is set in the request, the
+    planner's estimate from `pg_class` is returned instead, which does not
+    require to scan the table.
+    """
     table = get_or_403(request, 'table')
     schema = get_or_403(request, 'schema')
-    engine = _get_engine()
-    session = sessionmaker(bind=engine)()
-    t = _get_table(schema, table)
-    return session.query(t).count()  # _get_count(session.query(t))
+    session = Session()
+    try:
+        if read_bool(request.get('approximate', False)):
+            return session.execute(_estimate_count_sql,
+                                   {'schema': schema, 'table': table}).scalar()
+        t = _get_table(schema, table)
+        return session.execute(
+            sqla.select([func.count()]).select_from(t)).scalar()
+    finally:
+        session.close()
 
 
 def _get_header(results):
@@ -1111,12 +1626,16 @@ def _get_header(results):
     return header
 
 
+_analyze_columns_sql = sqla.text(
+    'select column_name as id, data_type as type '
+    'from information_schema.columns '
+    'where table_name = :table and table_schema = :schema;')
+
+
 def analyze_columns(schema, table):
-    engine = _get_engine()
-    result = engine.execute(
-        "select column_name as id, data_type as type from information_schema.columns where table_name = '{table}' and table_schema='{schema}';".format(
-            schema=schema, table=table))
-    return [{'id': get_or_403(r, 'id'), 'type': get_or_403(r, 'type')} for r in result]
+    with _get_engine().connect() as conn:
+        result = conn.execute(_analyze_columns_sql, schema=schema, table=table)
+        return [{'id': get_or_403(r, 'id'), 'type': get_or_403(r, 'type')} for r in result]
 
 
 def search(db, schema, table, fields=None, pk = None, offset = 0, limit = 100):
@@ -1139,10 +1658,27 @@ def search(db, schema, table, fields=None, pk = None, offset = 0, limit = 100):
     return engine.execute(sql_string, ), [dict(refs.first()).items()]
 
 
+_SPACE_TRANS = str.maketrans({' ': '_'})
+
+
 def clear_dict(d):
-    return {
-        k.replace(" ", "_"): d[k] if not isinstance(d[k], dict) else clear_dict(
-            d[k]) for k in d}
+    """
+    Returns a copy of `d` in which spaces in the keys of `d` and of all
+    nested dictionaries are replaced by underscores.
+    """
+    result = {}
+    stack = [(d, result)]
+    while stack:
+        source, target = stack.pop()
+        for k, v in source.items():
+            if ' ' in k:
+                k = k.translate(_SPACE_TRANS)
+            if isinstance(v, dict):
+                nested = {}
+                stack.append((v, nested))
+                v = nested
+            target[k] = v
+    return result
 
 
 def create_meta(schema, table):
@@ -1156,12 +1692,14 @@ def create_meta(schema, table):
     get_insert_table_name(schema, table)
 
 
+_comment_table_sql = sqla.text(
+    "select obj_description((:schema || '.' || :table)::regclass::oid, 'pg_class');")
+
+
 def get_comment_table(schema, table):
     engine = _get_engine()
 
-    sql_string = "select obj_description('{schema}.{table}'::regclass::oid, 'pg_class');".format(
-        schema=schema, table=table)
-    res = engine.execute(sql_string)
+    res = engine.execute(_comment_table_sql, schema=schema, table=table)
     if res:
         jsn = res.first().obj_description
         if jsn:
@@ -1188,11 +1726,8 @@ def connect():
 
 def has_schema(request, context=None):
     engine = _get_engine()
-    conn = engine.connect()
-    try:
+    with _get_engine().connect() as conn:
         result = engine.dialect.has_schema(conn, get_or_403(request, 'schema'))
-    finally:
-        conn.close()
     return result
 
 
@@ -1200,132 +1735,103 @@ def has_table(request, context=None):
     engine = _get_engine()
     schema = request.pop('schema', None)
     table = get_or_403(request, 'table')
-    conn = engine.connect()
-    try:
+    with _get_engine().connect() as conn:
         result = engine.dialect.has_table(conn, table,
                                           schema=schema)
-    finally:
-        conn.close()
     return result
 
 
 def has_sequence(request, context=None):
     engine = _get_engine()
-    conn = engine.connect()
-    try:
+    with _get_engine().connect() as conn:
         result = engine.dialect.has_sequence(conn,
                                              get_or_403(request, 'sequence_name'),
                                              schema=request.get('schema', None))
-    finally:
-        conn.close()
     return result
 
 
 def has_type(request, context=None):
     engine = _get_engine()
-    conn = engine.connect()
-    try:
-        result = engine.dialect.has_schema(conn,
-                                           get_or_403(request, 'sequence_name'),
-                                           schema=request.get('schema', None))
-    finally:
-        conn.close()
+    # Older clients pass the type name as sequence_name
+    type_name = (request['type_name'] if 'type_name' in request
+                 else get_or_403(request, 'sequence_name'))
+    with _get_engine().connect() as conn:
+        result = engine.dialect.has_type(conn, type_name,
+                                         schema=request.get('schema', None))
     return result
 
 
 def get_table_oid(request, context=None):
     engine = _get_engine()
-    conn = engine.connect()
-    try:
+    with _get_engine().connect() as conn:
         result = engine.dialect.get_table_oid(conn,
                                               get_or_403(request, 'table'),
                                               schema=request.get('schema', None),
                                               **request)
-    finally:
-        conn.close()
     return result
 
 
 def get_schema_names(request, context=None):
     engine = _get_engine()
-    conn = engine.connect()
-    try:
-        result = engine.dialect.get_schema_names(engine.connect(), **request)
-    finally:
-        conn.close()
+    with _get_engine().connect() as conn:
+        result = engine.dialect.get_schema_names(conn, **request)
     return result
 
 
 def get_table_names(request, context=None):
     engine = _get_engine()
-    conn = engine.connect()
-    try:
+    with _get_engine().connect() as conn:
         result = engine.dialect.get_table_names(conn,
                                                 schema=request.pop('schema',
                                                                    None),
                                                 **request)
-    finally:
-        conn.close()
     return result
 
 
 def get_view_names(request, context=None):
     engine = _get_engine()
-    conn = engine.connect()
-    try:
+    with _get_engine().connect() as conn:
         result = engine.dialect.get_view_names(conn,
                                                schema=request.pop('schema', None),
                                                **request)
-    finally:
-        conn.close()
     return result
 
 
 def get_view_definition(request, context=None):
     engine = _get_engine()
-    conn = engine.connect()
-    try:
-        result = engine.dialect.get_schema_names(conn,
-                                                 get_or_403(request, 'view_name'),
-                                                 schema=request.pop('schema',
-                                                                    None),
-                                                 **request)
-    finally:
-        conn.close()
+    schema = request.pop('schema', None)
+    get_or_403(request, 'view_name')
+    view_name = request.pop('view_name')
+    with _get_engine().connect() as conn:
+        result = engine.dialect.get_view_definition(conn, view_name,
+                                                    schema=schema, **request)
     return result
 
 
 def get_columns(request, context=None):
     engine = _get_engine()
-    conn = engine.connect()
-    try:
+    with _get_engine().connect() as conn:
         result = engine.dialect.get_columns(conn,
                                             get_or_403(request, 'table'),
                                             schema=request.pop('schema', None),
                                             **request)
-    finally:
-        conn.close()
     return result
 
 
 def get_pk_constraint(request, context=None):
     engine = _get_engine()
-    conn = engine.connect()
-    try:
+    with _get_engine().connect() as conn:
         result = engine.dialect.get_pk_constraint(conn,
                                                   get_or_403(request, 'table'),
                                                   schema=request.pop('schema',
                                                                      None),
                                                   **request)
-    finally:
-        conn.close()
     return result
 
 
 def get_foreign_keys(request, context=None):
     engine = _get_engine()
-    conn = engine.connect()
-    try:
+    with _get_engine().connect() as conn:
         result = engine.dialect.get_foreign_keys(conn,
                                                  get_or_403(request, 'table'),
                                                  schema=request.pop('schema',
@@ -1334,35 +1840,27 @@ def get_foreign_keys(request, context=None):
                                                      'postgresql_ignore_search_path',
                                                      False),
                                                  **request)
-    finally:
-        conn.close()
     return result
 
 
 def get_indexes(request, context=None):
     engine = _get_engine()
-    conn = engine.connect()
-    try:
+    with _get_engine().connect() as conn:
         result = engine.dialect.get_indexes(conn,
                                             get_or_403(request, 'table'),
                                             get_or_403(request, 'schema'),
                                             **request)
-    finally:
-        conn.close()
     return result
 
 
 def get_unique_constraints(request, context=None):
     engine = _get_engine()
-    conn = engine.connect()
-    try:
-        result = engine.dialect.get_foreign_keys(conn,
-                                                 get_or_403(request, 'table'),
-                                                 schema=request.pop('schema',
-                                                                    None),
-                                                 **request)
-    finally:
-        conn.close()
+    with _get_engine().connect() as conn:
+        result = engine.dialect.get_unique_constraints(conn,
+                                                       get_or_403(request, 'table'),
+                                                       schema=request.pop('schema',
+                                                                          None),
+                                                       **request)
     return result
 
 
@@ -1442,16 +1940,14 @@ def _get_default_schema_name(self, connection):
 def open_raw_connection(request, context):
     engine = _get_engine()
     connection = engine.connect().connection
-    connection_id = connection.__hash__()
-    if connection_id not in __CONNECTIONS:
-        __CONNECTIONS[connection_id]=connection
+    connection_id = __CONNECTIONS.add(connection)
     return {'connection_id': connection_id}
 
 
 def close_raw_connection(request, context):
     connection_id = request['connection_id']
-    if connection_id in __CONNECTIONS:
-        connection = __CONNECTIONS[connection_id]
+    connection = __CONNECTIONS.pop(connection_id)
+    if connection is not None:
         connection.close()
         return __response_success()
     else:
@@ -1460,28 +1956,26 @@ def close_raw_connection(request, context):
 
 def open_cursor(request, context):
     connection_id = context['connection_id']
-    if connection_id in __CONNECTIONS:
-        connection = __CONNECTIONS[connection_id]
+    connection = __CONNECTIONS.get(connection_id)
+    if connection is not None:
         cursor = connection.cursor()
-        cursor_id = cursor.__hash__()
-        __CURSORS[cursor_id] = cursor
+        cursor_id = __CURSORS.add(cursor)
         return {'cursor_id': cursor_id}
     else:
         return _response_error("Connection (%s) not found" % connection_id)
 
 
 def _load_cursor(cursor_id):
-    try:
-        return __CURSORS[cursor_id]
-    except KeyError:
-        raise ResponsiveException("Cursor (%s) not found" % cursor_id)
+    cursor = __CURSORS.get(cursor_id)
+    if cursor is None:
+        raise APIError("Cursor (%s) not found" % cursor_id, status=404)
+    return cursor
 
 
 def close_cursor(request, context):
     cursor_id = context['cursor_id']
-    if cursor_id in __CURSORS:
-        cursor = __CURSORS[cursor_id]
-        del __CURSORS[cursor_id]
+    cursor = __CURSORS.pop(cursor_id)
+    if cursor is not None:
         cursor.close()
         return {'cursor_id': cursor_id}
     else:
@@ -1503,37 +1997,79 @@ def fetchmany(request, context):
     return cursor.fetchmany(request['size'])
 
 
+@functools.lru_cache(maxsize=4096)
+def _meta_table_name(table, suffix):
+    return '_' + table + suffix
+
+
 def get_comment_table_name(schema, table, create=True):
-    table_name = '_' + table + '_cor'
-    if create and not has_table({'schema': get_meta_schema_name(schema),
-                                 'table': table_name}):
+    table_name = _meta_table_name(table, '_cor')
+    if create and not _table_exists(get_meta_schema_name(schema), table_name):
         create_edit_table(schema, table)
     return table_name
 
 
 def get_delete_table_name(schema, table, create=True):
-    table_name = '_' + table + '_delete'
-    if create and not has_table({'schema': get_meta_schema_name(schema),
-                                 'table': table_name}):
-        create_delete_table(schema, table)
+    table_name = _meta_table_name(table, '_delete')
+    if create:
+        _ensure_meta_tables(schema, table)
     return table_name
 
 
 def get_edit_table_name(schema, table, create=True):
-    table_name = '_' + table + '_edit'
-    if create and not has_table({'schema': get_meta_schema_name(schema),
-                                 'table': table_name}):
-        create_edit_table(schema, table)
+    table_name = _meta_table_name(table, '_edit')
+    if create:
+        _ensure_meta_tables(schema, table)
     return table_name
 
 
 def get_insert_table_name(schema, table, create=True):
-    table_name = '_' + table + '_insert'
-    if create and not has_table({'schema': get_meta_schema_name(schema),
-                                 'table': table_name}):
-        create_insert_table(schema, table)
+    table_name = _meta_table_name(table, '_insert')
+    if create:
+        _ensure_meta_tables(schema, table)
     return table_name
 
+# Names of the change tables per meta schema that are known to exist. Other
+# processes may drop them, so the names expire like the table lookups.
+_META_TABLES_CACHE = {}
+
+
+def _ensure_meta_tables(schema, table):
+    """
+    Makes sure the insert, edit and delete tables of `schema.table` exist.
+    Their existence is checked with a single query and all missing tables
+    are created in one transaction.
+    """
+    meta_schema = get_meta_schema_name(schema)
+    bucket = _cache_bucket(_TABLE_CACHE_TTL)
+    cached_bucket, known = _META_TABLES_CACHE.get(meta_schema, (None, None))
+    if cached_bucket != bucket:
+        known = set()
+        _META_TABLES_CACHE[meta_schema] = (bucket, known)
+    creators = {
+        get_insert_table_name(schema, table, create=False): create_insert_table,
+        get_edit_table_name(schema, table, create=False): create_edit_table,
+        get_delete_table_name(schema, table, create=False): create_delete_table,
+    }
+    missing = [name for name in creators if name not in known]
+    if not missing:
+        return
+    with _get_engine().begin() as connection:
+        existing = {row.tablename for row in connection.execute(
+            _existing_meta_tables_sql, schema=meta_schema, tables=missing)}
+        for name in missing:
+            if name not in existing:
+                creators[name](schema, table, meta_schema=meta_schema,
+                               connection=connection)
+    known.update(missing)
+
+
+_existing_meta_tables_sql = sqla.text(
+    'SELECT tablename FROM pg_tables '
+    'WHERE schemaname = :schema AND tablename = ANY(:tables);')
+
+
+@functools.lru_cache(maxsize=1024)
 def get_meta_schema_name(schema):
     return '_' + schema
 
@@ -1545,10 +2081,9 @@ def create_meta_schema(schema):
     connection.execute(query)
 
 
-def create_edit_table(schema, table, meta_schema=None):
+def create_edit_table(schema, table, meta_schema=None, connection=None):
     if not meta_schema:
         meta_schema = get_meta_schema_name(schema)
-    engine = _get_engine()
     query = 'CREATE TABLE "{meta_schema}"."{edit_table}" ' \
             '(LIKE "{schema}"."{table}" INCLUDING ALL EXCLUDING INDEXES, PRIMARY KEY (_id)) ' \
             'INHERITS (_edit_base);'.format(
@@ -1556,13 +2091,12 @@ def create_edit_table(schema, table, meta_schema=None):
         edit_table=get_edit_table_name(schema, table, create=False),
         schema=schema,
         table=table)
-    engine.execute(query)
+    (connection or _get_engine()).execute(query)
 
 
-def create_delete_table(schema, table, meta_schema=None):
+def create_delete_table(schema, table, meta_schema=None, connection=None):
     if not meta_schema:
         meta_schema = get_meta_schema_name(schema)
-    engine = _get_engine()
     query = 'CREATE TABLE {meta_schema}.{edit_table} ' \
             '(id bigint) ' \
             'INHERITS (_edit_base);'.format(
@@ -1570,12 +2104,11 @@ def create_delete_table(schema, table, meta_schema=None):
         edit_table=get_delete_table_name(schema, table, create=False),
         schema=schema,
         table=table)
-    engine.execute(query)
+    (connection or _get_engine()).execute(query)
 
-def create_insert_table(schema, table, meta_schema=None):
+def create_insert_table(schema, table, meta_schema=None, connection=None):
     if not meta_schema:
         meta_schema = get_meta_schema_name(schema)
-    engine = _get_engine()
     query = 'CREATE TABLE {meta_schema}.{edit_table} ' \
             '(LIKE {schema}.{table} INCLUDING ALL EXCLUDING INDEXES, PRIMARY KEY (_id)) ' \
             'INHERITS (_edit_base);'.format(
@@ -1583,7 +2116,7 @@ def create_insert_table(schema, table, meta_schema=None):
         edit_table=get_insert_table_name(schema, table, create=False),
         schema=schema,
         table=table)
-    engine.execute(query)
+    (connection or _get_engine()).execute(query)
 
 
 def create_comment_table(schema, table, meta_schema=None):
@@ -1598,14 +2131,15 @@ def create_comment_table(schema, table, meta_schema=None):
 
 
 def getValue(schema, table, column, id):
-    sql = "SELECT {column} FROM {schema}.{table} WHERE id={id}".format(column=column, schema=schema, table=table, id=id)
-
-    engine = _get_engine()
-    session = sessionmaker(bind=engine)()
+    # Identifiers can not be bound, so only the id is passed as parameter.
+    sql = sqla.text("SELECT {column} FROM {schema}.{table} WHERE id=:id".format(
+        column=read_pgid(column), schema=read_pgid(schema),
+        table=read_pgid(table)))
 
+    session = Session()
 
     try:
-        result = session.execute(sql)
+        result = session.execute(sql, {'id': id})
 
         returnValue = None
         for row in result:
@@ -1620,50 +2154,88 @@ def getValue(schema, table, column, id):
     return None
 
 
-def apply_changes(schema, table):
-    def add_type(d, type):
-        d['_type'] = type
-        return d
-    engine = _get_engine()
-    conn = engine.connect()
-    try:
-        meta_schema = get_meta_schema_name(schema)
+_drain_lock_sql = sqla.text(
+    "SELECT pg_advisory_xact_lock("
+    "format('%I.%I', :schema, :table)::regclass::oid::bigint);")
 
-        insert_table = get_insert_table_name(schema, table)
-        columns = list(describe_columns(schema, table).keys()) + ['_submitted', '_id']
-        changes = (add_type({c: getattr(row, c) for c in columns}, 'insert') for row in conn.execute('select * '
-                                'from {schema}.{table} '
-                                'where _applied = FALSE;'.format(schema=meta_schema,
-                                                                 table=insert_table)))
-
-
-        update_table = get_edit_table_name(schema, table)
-        changes = itertools.chain(changes, (add_type({c: getattr(row, c) for c in columns}, 'update') for row in conn.execute('select * '
-                                'from {schema}.{table} '
-                                'where _applied = FALSE;'.format(schema=meta_schema,
-                                                                 table=update_table))))
-
-        delete_table = get_delete_table_name(schema, table)
-        changes = itertools.chain(changes, (
-            add_type({c: getattr(row, c) for c in ['_id', 'id', '_submitted']}, 'delete') for row in
-            conn.execute('select * '
-                         'from {schema}.{table} '
-                         'where _applied = FALSE;'.format(schema=meta_schema,
-                                                          table=delete_table))))
-    finally:
-        conn.close()
 
-    changes = list(changes)
-    table_obj = Table(table, MetaData(bind=engine), autoload=True, schema=schema)
-    session = sessionmaker(bind=engine)()
+def drain_pending(session, schema, table):
+    """
+    Loads all pending changes of `schema.table` within the transaction of
+    `session`. The changes of a table have to be applied in order, so a
+    transaction lock on the table is taken first; concurrent callers wait
+    until that transaction ends and then only see the changes that are
+    still pending.
+    :return: List of changes in the order they were submitted, each a
+        dictionary tagged with its `_type`
+    """
+    meta_schema = get_meta_schema_name(schema)
+    insert_table = get_insert_table_name(schema, table, create=False)
+    update_table = get_edit_table_name(schema, table, create=False)
+    delete_table = get_delete_table_name(schema, table, create=False)
+
+    session.execute(_drain_lock_sql, {'schema': schema, 'table': table})
+
+    columns = list(describe_columns(schema, table).keys()) + ['_submitted', '_id']
+    delete_columns = ['_id', 'id', '_submitted']
+
+    # All pending changes are read by a single query that is already
+    # ordered by submission. Its branches are numbered, so that changes
+    # submitted at the same time keep the order insert, update, delete.
+    # The cells are read as they are, so that values keep the
+    # representation the database driver returns for their type.
+    branch = 'SELECT {type} AS _type, {index} AS _branch, {fields} ' \
+             'FROM (SELECT * FROM {schema}.{table} WHERE _applied = FALSE ' \
+             'FOR UPDATE) AS t'
+    fields = ', '.join('"%s"' % c for c in columns)
+    query = ' UNION ALL '.join([
+        branch.format(type="'insert'::text", index=0, fields=fields,
+                      schema=meta_schema, table=insert_table),
+        branch.format(type="'update'::text", index=1, fields=fields,
+                      schema=meta_schema, table=update_table),
+        branch.format(type="'delete'::text", index=2,
+                      fields=', '.join('"%s"' % c if c in delete_columns
+                                       else 'NULL' for c in columns),
+                      schema=meta_schema, table=delete_table)
+    ]) + ' ORDER BY _submitted, _branch, _id;'
+    changes = []
+    for row in session.execute(query):
+        change = {c: row[c] for c in (delete_columns
+                                      if row['_type'] == 'delete'
+                                      else columns)}
+        change['_type'] = row['_type']
+        changes.append(change)
+    return changes
+
+
+def apply_changes(schema, table):
+    meta_schema = get_meta_schema_name(schema)
+    _ensure_meta_tables(schema, table)
+    insert_table = get_insert_table_name(schema, table, create=False)
+    update_table = get_edit_table_name(schema, table, create=False)
+    delete_table = get_delete_table_name(schema, table, create=False)
+
+    table_obj = _get_table(schema, table)
+    change_tables = {'insert': insert_table, 'update': update_table,
+                     'delete': delete_table}
+    # Consecutive changes of the same type are applied together in batches
+    # of at most _APPLY_BATCH_SIZE rows, which keeps them in the order they
+    # were submitted. Changes are marked as applied by a single statement
+    # per meta table once all of them have been applied.
+    applied = {insert_table: [], update_table: [], delete_table: []}
+    session = Session()
     try:
-        for change in sorted(changes, key=lambda x: x['_submitted']):
-            if change['_type'] == 'insert':
-                apply_insert(session, table_obj, change)
-            elif change['_type'] == 'update':
-                apply_update(session, table_obj, change)
-            elif change['_type'] == 'delete':
-                apply_deletion(session, table_obj, change)
+        changes = drain_pending(session, schema, table)
+        for kind, run in itertools.groupby(changes, key=lambda c: c['_type']):
+            run = list(run)
+            for start in range(0, len(run), _APPLY_BATCH_SIZE):
+                apply_batch(session, table_obj,
+                            run[start:start + _APPLY_BATCH_SIZE], kind)
+            applied[change_tables[kind]].extend(c['_id'] for c in run)
+        for change_table, ids in applied.items():
+            if ids:
+                session.execute(_mark_applied_sql(meta_schema, change_table),
+                                {'ids': ids})
     except Exception as e:
         raise e
     else:
@@ -1672,32 +2244,109 @@ def apply_changes(schema, table):
         session.close()
 
 
-def apply_insert(session, table, row):
-    logger.info("apply insert", row)
-    session.execute(table.insert(), row)
-    session.execute('UPDATE {schema}.{table} SET _applied=TRUE WHERE id={id};'.format(
-        schema=get_meta_schema_name(table.schema),
-        table=get_insert_table_name(table.schema, table.name),
-        id=row['id']
-    ))
+@functools.lru_cache(maxsize=1024)
+def _mark_applied_sql(meta_schema, change_table):
+    """
+    Returns the statement that flags the changes with the ids bound to
+    `:ids` in `meta_schema.change_table` as applied. Identifiers can not
+    be bound, so one statement is built and kept per change table.
+    """
+    return sqla.text('UPDATE {schema}.{table} SET _applied=TRUE '
+                     'WHERE _id = ANY(:ids);'.format(schema=meta_schema,
+                                                     table=change_table))
+
+
+# Maximal number of changes that are applied by a single statement
+_APPLY_BATCH_SIZE = 1000
 
 
-def apply_update(session, table, row):
-    logger.info("apply update", row)
-    session.execute(table.update(table.c.id==row['id']), row)
+def apply_batch(session, table, rows, kind):
+    """
+    Applies a list of changes of the same kind to `table`.
+    :param session: Session to execute the changes in
+    :param table: Reflected table the changes are applied to
+    :param rows: Changes as loaded from the meta table
+    :param kind: 'insert', 'update' or 'delete'
+    """
+    if kind == 'insert':
+        apply_insert(session, table, rows)
+    elif kind == 'update':
+        apply_update(session, table, rows)
+    elif kind == 'delete':
+        apply_deletion(session, table, rows)
+
+
+def apply_insert(session, table, rows):
+    logger.info("apply %d insertions", len(rows))
+    columns = [c for c in table.columns if c.name in rows[0]]
+    if len(rows) == 1 or not all(isinstance(c.type, _COPY_TYPES)
+                                 for c in columns):
+        # Values of other types, e.g. arrays, ranges or hstore, are not
+        # written in their COPY syntax by _copy_text, so they are bound.
+        session.execute(table.insert(), rows)
+        return
+
+    # Larger batches are streamed by COPY, which the server does not need
+    # to parse and plan for every row. The rows are written in COPY's text
+    # format and sent on the connection of `session`, so that they are
+    # part of its transaction.
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write('\t'.join(_copy_text(c, row[c.name]) for c in columns))
+        buffer.write('\n')
+    buffer.seek(0)
+    preparer = session.bind.dialect.identifier_preparer
+    sql = 'COPY {table} ({columns}) FROM STDIN'.format(
+        table=preparer.format_table(table),
+        columns=', '.join(preparer.quote(c.name) for c in columns))
+    cursor = session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(sql, buffer)
+    finally:
+        cursor.close()
+
+
+# Column types whose values _copy_text writes as valid COPY input
+_COPY_TYPES = (sqla.String, sqla.Integer, sqla.Numeric, sqla.Boolean,
+               sqla.Date, sqla.DateTime, sqla.Time, sqla.Interval,
+               postgresql.INTERVAL, sqla.LargeBinary, sqla.JSON,
+               postgresql.UUID, geoalchemy2.Geometry, geoalchemy2.Geography)
+
+_COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n',
+                               '\r': '\\r'})
+
+
+def _copy_text(column, value):
+    """
+    Returns `value`, as loaded from a meta table for `column`, in the text
+    format of COPY.
+    """
+    if value is None:
+        return '\\N'
+    if isinstance(column.type, sqla.JSON):
+        value = json.dumps(value)
+    elif isinstance(value, bool):
+        return 't' if value else 'f'
+    elif isinstance(value, (bytes, memoryview)):
+        value = '\\x' + bytes(value).hex()
+    elif isinstance(value, timedelta):
+        value = '{} days {} seconds {} microseconds'.format(
+            value.days, value.seconds, value.microseconds)
+    return str(value).translate(_COPY_ESCAPES)
+
+
+def apply_update(session, table, rows):
+    logger.info("apply %d updates", len(rows))
+    # The id of the changed row is bound under a separate name, because the
+    # name of the column itself is taken by the new values.
     session.execute(
-        'UPDATE {schema}.{table} SET _applied=TRUE WHERE _id={id};'.format(
-            schema=get_meta_schema_name(table.schema),
-            table=get_edit_table_name(table.schema, table.name),
-            id=row['_id']
-        ))
-
-def apply_deletion(session, table, row):
-    logger.info("apply deletion", row)
-    session.execute(table.delete(table.c.id==row['id']), row)
+        table.update().where(table.c.id == sqla.bindparam('_change_id')),
+        [dict(row, _change_id=row['id']) for row in rows])
+
+
+def apply_deletion(session, table, rows):
+    logger.info("apply %d deletions", len(rows))
     session.execute(
-        'UPDATE {schema}.{table} SET _applied=TRUE WHERE _id={id};'.format(
-            schema=get_meta_schema_name(table.schema),
-            table=get_delete_table_name(table.schema, table.name),
-            id=row['_id']
-        ))
+        table.delete().where(
+            table.c.id.in_(sqla.bindparam('ids', expanding=True))),
+        {'ids': [row['id'] for row in rows]})
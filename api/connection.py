@@ -7,7 +7,11 @@ __ENGINE = sqla.create_engine(
         sec.dbpasswd,
         sec.dbhost,
         sec.dbport,
-        sec.dbname), pool_size=0)
+        sec.dbname),
+    # Connections are kept open for reuse without an upper bound, as a
+    # request may check out several at once. They are verified before they
+    # are handed out and replaced after half an hour.
+    pool_size=0, pool_pre_ping=True, pool_recycle=1800)
 
 def _get_engine():
     return __ENGINE
@@ -2,6 +2,7 @@
 # Parsers #
 ###########
 import decimal
+import functools
 import re
 from datetime import datetime
 from sqlalchemy import Table, MetaData, Column, select, column, func, literal_column, and_, or_
@@ -19,8 +20,11 @@ def get_or_403(dictionary, key):
         raise APIKeyError(dictionary, key)
 
 
+@functools.lru_cache(maxsize=4096)
 def is_pg_qual(x):
-    return pgsql_qualifier.search(x)
+    # Identifiers are validated over and over again for the same few names,
+    # so results are memoized per distinct string.
+    return pgsql_qualifier.fullmatch(x) is not None
 
 
 def quote(x):
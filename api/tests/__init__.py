@@ -44,6 +44,25 @@ class APITestCase(TestCase):
         cls.client = Client()
 
 
+    @classmethod
+    def drop_test_tables(cls, schema, table):
+        """
+        Drops a table and its insert, edit and delete tables with a single
+        statement. Tables that do not exist are skipped.
+        """
+        actions.perform_sql(
+            "DROP TABLE IF EXISTS {meta}.{insert}, {meta}.{edit}, "
+            "{meta}.{delete}, {schema}.{table}".format(
+                meta=actions.get_meta_schema_name(schema),
+                insert=actions.get_insert_table_name(schema, table,
+                                                     create=False),
+                edit=actions.get_edit_table_name(schema, table, create=False),
+                delete=actions.get_delete_table_name(schema, table,
+                                                     create=False),
+                schema=schema,
+                table=table
+            ))
+
     def assertDictEqualKeywise(self, d1, d2, excluded=None):
         if not excluded:
             excluded = []
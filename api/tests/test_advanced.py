@@ -0,0 +1,35 @@
+import json
+
+from api import actions
+from . import APITestCase
+
+
+class TestViewDefinition(APITestCase):
+
+    def setUp(self):
+        self.test_view = 'test_view_definition'
+        actions.perform_sql(
+            "CREATE VIEW {schema}.{view} AS SELECT 1 AS one".format(
+                schema=self.test_schema, view=self.test_view))
+
+    def tearDown(self):
+        actions.perform_sql(
+            "DROP VIEW IF EXISTS {schema}.{view}".format(
+                schema=self.test_schema, view=self.test_view))
+
+    def test_action(self):
+        definition = actions.get_view_definition(
+            {'schema': self.test_schema, 'view_name': self.test_view})
+        self.assertIn('one', definition)
+
+    def test_api(self):
+        response = self.__class__.client.post(
+            '/api/v0/advanced/get_view_definition',
+            data=json.dumps({'query': {'schema': self.test_schema,
+                                       'view_name': self.test_view}}),
+            HTTP_AUTHORIZATION='Token %s' % self.__class__.token,
+            content_type='application/json')
+
+        self.assertEqual(response.status_code, 200,
+                         response.json().get('reason', 'No reason returned'))
+        self.assertIn('one', response.json()['content'])
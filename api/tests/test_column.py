@@ -1,84 +1,61 @@
 import json
 
-from api import actions
 from . import APITestCase
 
+TABLE_STRUCTURE = {
+    "constraints": [
+        {
+            "constraint_type": "PRIMARY KEY",
+            "constraint_parameter": "id",
+            "reference_table": None,
+            "reference_column": None
+        }
+    ],
+    "columns": [
+        {
+            "name": "id",
+            "data_type": "bigserial",
+            "is_nullable": False,
+            "character_maximum_length": None
+        },
+        {
+            "name": "name",
+            "data_type": "character varying",
+            "is_nullable": True,
+            "character_maximum_length": 50
+        }, {
+            "name": "address",
+            "data_type": "character varying",
+            "is_nullable": True,
+            "character_maximum_length": 150
+        }, {
+            "name": "geom",
+            "data_type": "Geometry (Point)",
+            "is_nullable": True,
+        }
+    ]
+}
+
+# Both test classes create the same table, so encode its body only once
+TABLE_BODY = json.dumps({'query': TABLE_STRUCTURE})
+
 
 class TestPut(APITestCase):
 
     def setUp(self):
         self.test_table = 'test_table_column'
         self.test_schema = 'test'
-        self.structure_data = {
-            "constraints": [
-                {
-                    "constraint_type": "PRIMARY KEY",
-                    "constraint_parameter": "id",
-                    "reference_table": None,
-                    "reference_column": None
-                }
-            ],
-            "columns": [
-                {
-                    "name": "id",
-                    "data_type": "bigserial",
-                    "is_nullable": False,
-                    "character_maximum_length": None
-                },
-                {
-                    "name": "name",
-                    "data_type": "character varying",
-                    "is_nullable": True,
-                    "character_maximum_length": 50
-                }, {
-                    "name": "address",
-                    "data_type": "character varying",
-                    "is_nullable": True,
-                    "character_maximum_length": 150
-                }, {
-                    "name": "geom",
-                    "data_type": "Geometry (Point)",
-                    "is_nullable": True,
-                }
-            ]
-        }
-
         c_basic_resp = self.__class__.client.put(
             '/api/v0/schema/{schema}/tables/{table}/'.format(
                 schema=self.test_schema, table=self.test_table),
-            data=json.dumps({'query': self.structure_data}),
+            data=TABLE_BODY,
             HTTP_AUTHORIZATION='Token %s' % self.__class__.token,
             content_type='application/json')
 
         assert c_basic_resp.status_code==201, c_basic_resp.json().get('reason','No reason returned')
 
     def tearDown(self):
-        meta_schema = actions.get_meta_schema_name(self.test_schema)
-        if actions.has_table(
-                dict(table=self.test_table, schema=self.test_schema)):
-            actions.perform_sql(
-                "DROP TABLE IF EXISTS {schema}.{table} CASCADE".format(
-                    schema=meta_schema,
-                    table=actions.get_insert_table_name(self.test_schema,
-                                                        self.test_table)
-                ))
-            actions.perform_sql(
-                "DROP TABLE IF EXISTS {schema}.{table} CASCADE".format(
-                    schema=meta_schema,
-                    table=actions.get_edit_table_name(self.test_schema,
-                                                      self.test_table)
-                ))
-            actions.perform_sql(
-                "DROP TABLE IF EXISTS {schema}.{table} CASCADE".format(
-                    schema=meta_schema,
-                    table=actions.get_delete_table_name(self.test_schema,
-                                                        self.test_table)
-                ))
-            actions.perform_sql(
-                "DROP TABLE IF EXISTS {schema}.{table} CASCADE".format(
-                    schema=self.test_schema,
-                    table=self.test_table
-                ))
+        self.drop_test_tables(self.test_schema, self.test_table)
 
 
     def test_simple(self):
@@ -138,76 +115,17 @@ class TestPost(APITestCase):
     def setUp(self):
         self.test_table = 'test_table_column'
         self.test_schema = 'test'
-        self.structure_data = {
-            "constraints": [
-                {
-                    "constraint_type": "PRIMARY KEY",
-                    "constraint_parameter": "id",
-                    "reference_table": None,
-                    "reference_column": None
-                }
-            ],
-            "columns": [
-                {
-                    "name": "id",
-                    "data_type": "bigserial",
-                    "is_nullable": False,
-                    "character_maximum_length": None
-                },
-                {
-                    "name": "name",
-                    "data_type": "character varying",
-                    "is_nullable": True,
-                    "character_maximum_length": 50
-                }, {
-                    "name": "address",
-                    "data_type": "character varying",
-                    "is_nullable": True,
-                    "character_maximum_length": 150
-                }, {
-                    "name": "geom",
-                    "data_type": "Geometry (Point)",
-                    "is_nullable": True,
-                }
-            ]
-        }
-
         c_basic_resp = self.__class__.client.put(
             '/api/v0/schema/{schema}/tables/{table}/'.format(
                 schema=self.test_schema, table=self.test_table),
-            data=json.dumps({'query': self.structure_data}),
+            data=TABLE_BODY,
             HTTP_AUTHORIZATION='Token %s' % self.__class__.token,
             content_type='application/json')
 
         assert c_basic_resp.status_code==201, c_basic_resp.json().get('reason','No reason returned')
 
     def tearDown(self):
-        meta_schema = actions.get_meta_schema_name(self.test_schema)
-        if actions.has_table(
-                dict(table=self.test_table, schema=self.test_schema)):
-            actions.perform_sql(
-                "DROP TABLE IF EXISTS {schema}.{table} CASCADE".format(
-                    schema=meta_schema,
-                    table=actions.get_insert_table_name(self.test_schema,
-                                                        self.test_table)
-                ))
-            actions.perform_sql(
-                "DROP TABLE IF EXISTS {schema}.{table} CASCADE".format(
-                    schema=meta_schema,
-                    table=actions.get_edit_table_name(self.test_schema,
-                                                      self.test_table)
-                ))
-            actions.perform_sql(
-                "DROP TABLE IF EXISTS {schema}.{table} CASCADE".format(
-                    schema=meta_schema,
-                    table=actions.get_delete_table_name(self.test_schema,
-                                                        self.test_table)
-                ))
-            actions.perform_sql(
-                "DROP TABLE IF EXISTS {schema}.{table} CASCADE".format(
-                    schema=self.test_schema,
-                    table=self.test_table
-                ))
+        self.drop_test_tables(self.test_schema, self.test_table)
 
     def test_rename(self):
         self.structure_data = {'name': 'name2'}
@@ -1,5 +1,3 @@
-from api import actions
-from django.contrib.auth import get_user_model
 from api.tests import APITestCase
 import json
 
@@ -1,5 +1,4 @@
 from . import APITestCase
-from api import actions
 import json
 
 from shapely import wkt, wkb
@@ -51,32 +50,7 @@ class TestPut(APITestCase):
         assert c_basic_resp.status_code==201, c_basic_resp.json().get('reason','No reason returned')
 
     def tearDown(self):
-        meta_schema = actions.get_meta_schema_name(self.test_schema)
-        if actions.has_table(
-                dict(table=self.test_table, schema=self.test_schema)):
-            actions.perform_sql(
-                "DROP TABLE IF EXISTS {schema}.{table} CASCADE".format(
-                    schema=meta_schema,
-                    table=actions.get_insert_table_name(self.test_schema,
-                                                        self.test_table)
-                ))
-            actions.perform_sql(
-                "DROP TABLE IF EXISTS {schema}.{table} CASCADE".format(
-                    schema=meta_schema,
-                    table=actions.get_edit_table_name(self.test_schema,
-                                                      self.test_table)
-                ))
-            actions.perform_sql(
-                "DROP TABLE IF EXISTS {schema}.{table} CASCADE".format(
-                    schema=meta_schema,
-                    table=actions.get_delete_table_name(self.test_schema,
-                                                        self.test_table)
-                ))
-            actions.perform_sql(
-                "DROP TABLE IF EXISTS {schema}.{table} CASCADE".format(
-                    schema=self.test_schema,
-                    table=self.test_table
-                ))
+        self.drop_test_tables(self.test_schema, self.test_table)
 
     def test_put_with_id(self):
         row = {'id': 1, 'name': 'John Doe', 'address': None}
@@ -252,32 +226,7 @@ class TestPost(APITestCase):
         assert c_basic_resp.status_code==201, 'Returned %d: %s'%(c_basic_resp.status_code, c_basic_resp.json().get('reason','No reason returned'))
 
     def tearDown(self):
-        meta_schema = actions.get_meta_schema_name(self.test_schema)
-        if actions.has_table(
-                dict(table=self.test_table, schema=self.test_schema)):
-            actions.perform_sql(
-                "DROP TABLE IF EXISTS {schema}.{table} CASCADE".format(
-                    schema=meta_schema,
-                    table=actions.get_insert_table_name(self.test_schema,
-                                                        self.test_table)
-                ))
-            actions.perform_sql(
-                "DROP TABLE IF EXISTS {schema}.{table} CASCADE".format(
-                    schema=meta_schema,
-                    table=actions.get_edit_table_name(self.test_schema,
-                                                      self.test_table)
-                ))
-            actions.perform_sql(
-                "DROP TABLE IF EXISTS {schema}.{table} CASCADE".format(
-                    schema=meta_schema,
-                    table=actions.get_delete_table_name(self.test_schema,
-                                                        self.test_table)
-                ))
-            actions.perform_sql(
-                "DROP TABLE IF EXISTS {schema}.{table} CASCADE".format(
-                    schema=self.test_schema,
-                    table=self.test_table
-                ))
+        self.drop_test_tables(self.test_schema, self.test_table)
 
     def test_simple_post_new(self, rid=1):
         row = {'id': rid, 'name': 'Mary Doe', 'address': "Mary's Street",
@@ -371,6 +320,20 @@ class TestPost(APITestCase):
         row['geom'] = wkb.dumps(wkt.loads(row['geom']), hex=True)
         self.assertDictEqualKeywise(response.json(), row)
 
+    def test_post_conflicting_id(self):
+        self.test_simple_post_new()
+        row = {'id': 2, 'name': 'John Doe'}
+
+        response = self.__class__.client.post(
+            '/api/v0/schema/{schema}/tables/{table}/rows/1'.format(
+                schema=self.test_schema, table=self.test_table),
+            data=json.dumps({'query': row}),
+            HTTP_AUTHORIZATION='Token %s' % self.__class__.token,
+            content_type='application/json')
+
+        self.assertEqual(response.status_code, 409,
+                         response.json().get('reason', 'No reason returned'))
+
     def test_bulk_insert(self):
         rows = [{'id': rid, 'name': 'Mary Doe', 'address': "Mary's Street",
                'geom': None} for rid in range(0,23)]
@@ -394,6 +357,145 @@ class TestPost(APITestCase):
 
         self.assertListEqual(response.json(), rows)
 
+    def post_rows(self, rows, where=None):
+        url = '/api/v0/schema/{schema}/tables/{table}/rows/'.format(
+            schema=self.test_schema, table=self.test_table)
+        if where:
+            url += '?where=' + where
+        else:
+            url += 'new'
+        response = self.__class__.client.post(
+            url,
+            data=json.dumps({'query': rows}),
+            HTTP_AUTHORIZATION='Token %s' % self.__class__.token,
+            content_type='application/json')
+
+        self.assertEqual(response.status_code, 200 if where else 201,
+                         response.json().get('reason', 'No reason returned'))
+
+    def get_rows(self):
+        response = self.__class__.client.get(
+            '/api/v0/schema/{schema}/tables/{table}/rows/'.format(
+                schema=self.test_schema, table=self.test_table))
+
+        self.assertEqual(response.status_code, 200,
+                         'Returned %d: %s'%(response.status_code, response.json()))
+        return response.json()
+
+    def special_rows(self):
+        return [
+            {'id': 1, 'name': 'Back\\slash', 'address': 'Tab\tStreet',
+             'geom': 'POINT(-71.160281 42.258729)'},
+            {'id': 2, 'name': 'New\nLine', 'address': None, 'geom': None},
+            {'id': 3, 'name': '\\N', 'address': 'Carriage\rReturn',
+             'geom': None},
+        ]
+
+    def expected_rows(self, rows):
+        for row in rows:
+            if row['geom'] is not None:
+                row['geom'] = wkb.dumps(wkt.loads(row['geom']), hex=True)
+        return rows
+
+    def test_bulk_insert_special_characters(self):
+        # Several rows are applied with COPY
+        rows = self.special_rows()
+        self.post_rows(rows)
+        self.assertListEqual(self.get_rows(), self.expected_rows(rows))
+
+    def test_insert_special_characters_single_row(self):
+        # Single rows are applied with a bound INSERT
+        rows = self.special_rows()
+        for row in rows:
+            self.post_rows(dict(row))
+        self.assertListEqual(self.get_rows(), self.expected_rows(rows))
+
+    def test_bulk_insert_pages(self):
+        # More rows than fit in one INSERT page or one applied batch
+        rows = [{'id': rid, 'name': 'Mary Doe %d' % rid, 'address': None,
+                 'geom': None} for rid in range(2501)]
+        self.post_rows(rows)
+        self.assertListEqual(self.get_rows(), rows)
+
+    def test_bulk_update(self):
+        rows = [{'id': rid, 'name': 'Mary Doe', 'address': None,
+                 'geom': None} for rid in range(30)]
+        self.post_rows(rows)
+
+        self.post_rows({'name': 'John Doe'}, where='id>=10')
+
+        for row in rows[10:]:
+            row['name'] = 'John Doe'
+        self.assertListEqual(self.get_rows(), rows)
+
+
+class TestArrayRows(APITestCase):
+
+    def setUp(self):
+        self.test_table = 'test_table_array_rows'
+        structure_data = {
+            "constraints": [
+                {
+                    "constraint_type": "PRIMARY KEY",
+                    "constraint_parameter": "id",
+                    "reference_table": None,
+                    "reference_column": None
+                }
+            ],
+            "columns": [
+                {
+                    "name": "id",
+                    "data_type": "bigserial",
+                    "is_nullable": False,
+                    "character_maximum_length": None
+                },
+                {
+                    "name": "tags",
+                    "data_type": "text[]",
+                    "is_nullable": True,
+                    "character_maximum_length": None
+                }
+            ]
+        }
+
+        response = self.__class__.client.put(
+            '/api/v0/schema/{schema}/tables/{table}/'.format(
+                schema=self.test_schema, table=self.test_table),
+            data=json.dumps({'query': structure_data}),
+            HTTP_AUTHORIZATION='Token %s' % self.__class__.token,
+            content_type='application/json')
+
+        assert response.status_code == 201, response.json().get(
+            'reason', 'No reason returned')
+
+    def tearDown(self):
+        self.drop_test_tables(self.test_schema, self.test_table)
+
+    def test_bulk_insert(self):
+        # Tables with array columns are not applied with COPY
+        rows = [{'id': 1, 'tags': ['a', 'b\tc']},
+                {'id': 2, 'tags': None},
+                {'id': 3, 'tags': []}]
+
+        response = self.__class__.client.post(
+            '/api/v0/schema/{schema}/tables/{table}/rows/new'.format(
+                schema=self.test_schema, table=self.test_table),
+            data=json.dumps({'query': rows}),
+            HTTP_AUTHORIZATION='Token %s' % self.__class__.token,
+            content_type='application/json')
+
+        self.assertEqual(response.status_code, 201,
+                         response.json().get('reason', 'No reason returned'))
+
+        response = self.__class__.client.get(
+            '/api/v0/schema/{schema}/tables/{table}/rows/'.format(
+                schema=self.test_schema, table=self.test_table))
+
+        self.assertEqual(response.status_code, 200,
+                         'Returned %d: %s'%(response.status_code, response.json()))
+        self.assertListEqual(response.json(), rows)
+
+
 class TestGet(APITestCase):
     @classmethod
     def setUpClass(cls):
@@ -460,32 +562,7 @@ class TestGet(APITestCase):
     @classmethod
     def tearDownClass(self):
         super(TestGet, self).tearDownClass()
-        meta_schema = actions.get_meta_schema_name(self.test_schema)
-        if actions.has_table(
-                dict(table=self.test_table, schema=self.test_schema)):
-            actions.perform_sql(
-                "DROP TABLE IF EXISTS {schema}.{table} CASCADE".format(
-                    schema=meta_schema,
-                    table=actions.get_insert_table_name(self.test_schema,
-                                                        self.test_table)
-                ))
-            actions.perform_sql(
-                "DROP TABLE IF EXISTS {schema}.{table} CASCADE".format(
-                    schema=meta_schema,
-                    table=actions.get_edit_table_name(self.test_schema,
-                                                      self.test_table)
-                ))
-            actions.perform_sql(
-                "DROP TABLE IF EXISTS {schema}.{table} CASCADE".format(
-                    schema=meta_schema,
-                    table=actions.get_delete_table_name(self.test_schema,
-                                                        self.test_table)
-                ))
-            actions.perform_sql(
-                "DROP TABLE IF EXISTS {schema}.{table} CASCADE".format(
-                    schema=self.test_schema,
-                    table=self.test_table
-                ))
+        self.drop_test_tables(self.test_schema, self.test_table)
 
     def test_simple_get(self):
         response = self.__class__.client.get(
@@ -606,32 +683,7 @@ class TestDelete(APITestCase):
     @classmethod
     def tearDownClass(self):
         super(TestDelete, self).tearDownClass()
-        meta_schema = actions.get_meta_schema_name(self.test_schema)
-        if actions.has_table(
-                dict(table=self.test_table, schema=self.test_schema)):
-            actions.perform_sql(
-                "DROP TABLE IF EXISTS {schema}.{table} CASCADE".format(
-                    schema=meta_schema,
-                    table=actions.get_insert_table_name(self.test_schema,
-                                                        self.test_table)
-                ))
-            actions.perform_sql(
-                "DROP TABLE IF EXISTS {schema}.{table} CASCADE".format(
-                    schema=meta_schema,
-                    table=actions.get_edit_table_name(self.test_schema,
-                                                      self.test_table)
-                ))
-            actions.perform_sql(
-                "DROP TABLE IF EXISTS {schema}.{table} CASCADE".format(
-                    schema=meta_schema,
-                    table=actions.get_delete_table_name(self.test_schema,
-                                                        self.test_table)
-                ))
-            actions.perform_sql(
-                "DROP TABLE IF EXISTS {schema}.{table} CASCADE".format(
-                    schema=self.test_schema,
-                    table=self.test_table
-                ))
+        self.drop_test_tables(self.test_schema, self.test_table)
 
     def test_simple(self):
         row = self.rows.pop()
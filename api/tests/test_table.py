@@ -1,7 +1,6 @@
 import json
 
 from api.tests import APITestCase
-from api import actions
 
 _TYPES = ['bigint', 'bit', 'boolean', 'char', 'date', 'decimal', 'float',
           'integer', 'interval', 'json', 'nchar', 'numeric', 'real', 'smallint',
@@ -321,32 +320,7 @@ class TestDelete(APITestCase):
 
     def tearDown(self):
         super(TestDelete, self).tearDown()
-        meta_schema = actions.get_meta_schema_name(self.test_schema)
-        if actions.has_table(
-                dict(table=self.test_table, schema=self.test_schema)):
-            actions.perform_sql(
-                "DROP TABLE IF EXISTS {schema}.{table} CASCADE".format(
-                    schema=meta_schema,
-                    table=actions.get_insert_table_name(self.test_schema,
-                                                        self.test_table)
-                ))
-            actions.perform_sql(
-                "DROP TABLE IF EXISTS {schema}.{table} CASCADE".format(
-                    schema=meta_schema,
-                    table=actions.get_edit_table_name(self.test_schema,
-                                                      self.test_table)
-                ))
-            actions.perform_sql(
-                "DROP TABLE IF EXISTS {schema}.{table} CASCADE".format(
-                    schema=meta_schema,
-                    table=actions.get_delete_table_name(self.test_schema,
-                                                        self.test_table)
-                ))
-            actions.perform_sql(
-                "DROP TABLE IF EXISTS {schema}.{table} CASCADE".format(
-                    schema=self.test_schema,
-                    table=self.test_table
-                ))
+        self.drop_test_tables(self.test_schema, self.test_table)
 
     def test_simple(self):
         response = self.__class__.client.delete(
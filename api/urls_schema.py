@@ -0,0 +1,15 @@
+from django.conf.urls import url
+
+from api import views
+
+# Endpoints of a single table. They are included below the
+# v0/schema/<schema>/tables/<table>/ prefix by api.urls.
+urlpatterns = [
+    url(r'^$', views.Table.as_view()),
+    url(r'^columns/$', views.Column.as_view()),
+    url(r'^columns/(?P<column>[\w\s]+)$', views.Column.as_view()),
+    url(r'^id/(?P<id>\d+)/column/(?P<column>[\w\s]+)/$', views.Fields.as_view()),
+    url(r'^indexes/(?P<index>[\w\s]+)$', views.Index.as_view()),
+    url(r'^rows/(?P<row_id>\d+)?$', views.Rows.as_view()),
+    url(r'^rows/new?$', views.Rows.as_view(),{'action':'new'}),
+]
@@ -30,17 +30,11 @@ WHERE_EXPRESSION = re.compile('^(?P<first>[\w\d_\.]+)\s*(?P<operator>' \
                               + '|'.join(parser.sql_operators) \
                               + ')\s*(?P<second>(?![>=]).+)$')
 
-def cors(allow):
-    def doublewrapper(f):
-        def wrapper(*args, **kwargs):
-            response = f(*args, **kwargs)
-            if allow:
-                response['Access-Control-Allow-Origin'] = '*'
-                response["Access-Control-Allow-Methods"] = 'POST'
-                response["Access-Control-Allow-Headers"] = "Content-Type"
-            return response
-        return wrapper
-    return doublewrapper
+def set_cors_headers(response):
+    response['Access-Control-Allow-Origin'] = '*'
+    response["Access-Control-Allow-Methods"] = 'POST'
+    response["Access-Control-Allow-Headers"] = "Content-Type"
+    return response
 
 
 def api_exception(f):
@@ -229,6 +223,7 @@ class Table(APIView):
         actions._get_engine().execute(
             'DROP TABLE {schema}.{table} CASCADE;'.format(schema=schema,
                                                           table=table))
+        actions.clear_describe_cache()
 
         return JsonResponse({}, status=status.HTTP_200_OK)
 
@@ -581,52 +576,102 @@ def date_handler(obj):
 # Create your views here.
 
 
-def create_ajax_handler(func, allow_cors=False):
+# Operations offered below v0/advanced/ by the name used in the URL
+ADVANCED_ACTIONS = {
+    'search': actions.data_search,
+    'info': actions.data_info,
+    'update': actions.data_update,
+    'has_schema': actions.has_schema,
+    'has_table': actions.has_table,
+    'has_sequence': actions.has_sequence,
+    'has_type': actions.has_type,
+    'get_schema_names': actions.get_schema_names,
+    'get_table_names': actions.get_table_names,
+    'get_view_names': actions.get_view_names,
+    'get_view_definition': actions.get_view_definition,
+    'get_columns': actions.get_columns,
+    'get_pk_constraint': actions.get_pk_constraint,
+    'get_foreign_keys': actions.get_foreign_keys,
+    'get_indexes': actions.get_indexes,
+    'get_unique_constraints': actions.get_unique_constraints,
+    'request_dump': actions.get_unique_constraints,
+
+    'open_raw_connection': actions.open_raw_connection,
+    'close_raw_connection': actions.close_raw_connection,
+    'open_cursor': actions.open_cursor,
+    'close_cursor': actions.close_cursor,
+    'fetch_one': actions.fetchone,
+    'fetch_many': actions.fetchmany,
+    'fetch_all': actions.fetchall,
+
+    'set_isolation_level': actions.set_isolation_level,
+    'get_isolation_level': actions.get_isolation_level,
+    'do_begin_twophase': actions.do_begin_twophase,
+    'do_prepare_twophase': actions.do_prepare_twophase,
+    'do_rollback_twophase': actions.do_rollback_twophase,
+    'do_commit_twophase': actions.do_commit_twophase,
+    'do_recover_twophase': actions.do_recover_twophase,
+
+    'show_revisions': actions.get_unique_constraints,
+}
+
+# Operations that may be requested from other origins
+ADVANCED_CORS = {'search'}
+
+
+class AdvancedAction(APIView):
     """
-    Implements a mapper from api pages to the corresponding functions in
-    api/actions.py
-    :param func: The name of the callable function
-    :return: A JSON-Response that contains a dictionary with the corresponding response stored in *content*
+    Implements a mapper from v0/advanced/<op> to the corresponding function
+    in api/actions.py, which is looked up in ADVANCED_ACTIONS. The response
+    is a JSON-Response that contains a dictionary with the result stored in
+    *content*.
     """
-    class AJAX_View(APIView):
-
-        @cors(allow_cors)
-        @api_exception
-        def options(self, request, *args, **kwargs):
-            response = HttpResponse()
-
-            return response
-
-        @cors(allow_cors)
-        @api_exception
-        def post(self, request):
-            response = JsonResponse(self.execute(request))
-            if allow_cors and request.user.is_anonymous:
-                response['Access-Control-Allow-Origin'] = '*'
-            return response
-
-        @actions.load_cursor
-        def execute(self, request):
-            content = request.data
-            context = {'user': request.user,
-                       'cursor_id': request.data['cursor_id']}
-            query = content.get('query', ['{}'])
-            try:
-                if isinstance(query, list):
-                    query = query[0]
-                if isinstance(query, str):
-                    query = json.loads(query)
-            except:
-                raise APIError('Your query is not properly formated.')
-            data = func(query, context)
-
-            # This must be done in order to clean the structure of non-serializable
-            # objects (e.g. datetime)
-            response_data = json.loads(json.dumps(data, default=date_handler))
-            return {'content': response_data,
-                    'cursor_id': context['cursor_id']}
-
-    return AJAX_View.as_view()
+
+    def options(self, request, op):
+        _get_advanced_action(op)
+        response = HttpResponse()
+        if op in ADVANCED_CORS:
+            set_cors_headers(response)
+        return response
+
+    def post(self, request, op):
+        func = _get_advanced_action(op)
+        response = self.__respond(request, func)
+        if op in ADVANCED_CORS:
+            set_cors_headers(response)
+        return response
+
+    @api_exception
+    def __respond(self, request, func):
+        return JsonResponse(self.execute(request, func))
+
+    @actions.load_cursor
+    def execute(self, request, func):
+        content = request.data
+        context = {'user': request.user,
+                   'cursor_id': request.data['cursor_id']}
+        query = content.get('query', ['{}'])
+        try:
+            if isinstance(query, list):
+                query = query[0]
+            if isinstance(query, str):
+                query = json.loads(query)
+        except:
+            raise APIError('Your query is not properly formated.')
+        data = func(query, context)
+
+        # This must be done in order to clean the structure of non-serializable
+        # objects (e.g. datetime)
+        response_data = json.loads(json.dumps(data, default=date_handler))
+        return {'content': response_data,
+                'cursor_id': context['cursor_id']}
+
+
+def _get_advanced_action(op):
+    try:
+        return ADVANCED_ACTIONS[op]
+    except KeyError:
+        raise Http404
 
 
 def stream(data):